@@ -3,42 +3,70 @@ Celery tasks for Job Copilot agent system.
 Enables asynchronous job processing with Redis backend.
 
 Setup:
-1. Add to requirements: celery[redis]
+1. Add to requirements: celery[redis], msgpack
 2. Configure in settings
-3. Start worker: celery -A app.services.agents.celery_tasks worker -l info
+3. Start worker: celery -A app.services.agents.celery_tasks worker -l info -Ofair --concurrency=<CPUs * 4>
+   (tasks spend most of their time waiting on the LLM API, so run more
+   processes than cores and let -Ofair hand work to whichever is idle)
 4. Start beat (if needed): celery -A app.services.agents.celery_tasks beat
 """
 
 import asyncio
+import hashlib
 import logging
+import os
+import threading
+from collections.abc import Coroutine
+from typing import Any
 
-from celery import Celery, Task  # type: ignore[import-untyped]
+import orjson
+from celery import Celery, Task, chain, group  # type: ignore[import-untyped]
 from celery.exceptions import SoftTimeLimitExceeded  # type: ignore[import-untyped]
+from celery.signals import worker_process_init  # type: ignore[import-untyped]
+from celery.utils import uuid  # type: ignore[import-untyped]
 
 from app.services.agents import get_job_copilot_graph, init_llm
-from app.services.agents.utils import export_workflow_result, get_summary
+from app.services.agents.job_copilot_graph import JobCopilotGraph, NodeCompleteCallback
+from app.services.agents.utils import (
+    STREAM_END_EVENT,
+    dump_for_json,
+    export_workflow_result,
+    get_stream_channel,
+    get_summary,
+)
 
 logger = logging.getLogger(__name__)
 
 # Initialize Celery app
 # This should be configured in your project settings
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
 app = Celery(
     'job_copilot',
-    broker='redis://localhost:6379/0',
-    backend='redis://localhost:6379/0',
+    broker=REDIS_URL,
+    backend=REDIS_URL,
 )
 
 # Configuration
 app.conf.update(
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    # msgpack is smaller and faster to encode than JSON for the large
+    # exported results; JSON is still accepted from older producers
+    task_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_serializer='msgpack',
+    result_accept_content=['msgpack', 'json'],
     timezone='UTC',
     enable_utc=True,
     task_soft_time_limit=60,  # 60 second soft timeout
     task_time_limit=120,       # 120 second hard timeout
     result_expires=3600,       # Results expire in 1 hour
-    worker_prefetch_multiplier=1,  # Don't prefetch tasks
+    # LLM tasks are I/O-bound with highly variable duration: acknowledge only
+    # once finished so a lost worker's task is redelivered, and keep the
+    # prefetch window small so a slow task doesn't hold queued siblings.
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=2,
+    worker_disable_rate_limits=True,
 )
 
 
@@ -47,19 +75,187 @@ class CallbackTask(Task):
 
     def on_success(self, retval: object, task_id: str, args: tuple, kwargs: dict) -> None:
         """Success callback."""
-        logger.info(f"Task {task_id} completed successfully")
+        logger.info("Task %s completed successfully", task_id)
 
     def on_retry(self, exc: Exception, task_id: str, args: tuple, kwargs: dict, einfo: object) -> None:
         """Retry callback."""
-        logger.warning(f"Task {task_id} retrying due to: {exc}")
+        logger.warning("Task %s retrying due to: %s", task_id, exc)
 
     def on_failure(self, exc: Exception, task_id: str, args: tuple, kwargs: dict, einfo: object) -> None:
         """Failure callback."""
-        logger.error(f"Task {task_id} failed with exception: {exc}", exc_info=einfo)
+        logger.error("Task %s failed with exception: %s", task_id, exc, exc_info=einfo)
 
 
 app.Task = CallbackTask
 
+# Event loop owned by this worker process, started by worker_process_init
+_worker_loop: asyncio.AbstractEventLoop | None = None
+
+# Workflow graph bound once per worker process by worker_process_init
+_GRAPH: JobCopilotGraph | None = None
+
+
+@worker_process_init.connect
+def _start_worker_loop(**_kwargs: object) -> None:
+    """Start a long-lived event loop thread for this worker process."""
+    global _worker_loop
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="job-copilot-loop", daemon=True).start()
+    _worker_loop = loop
+
+
+@worker_process_init.connect
+def _init_worker_graph(**_kwargs: object) -> None:
+    """Initialize the LLM client and workflow graph for this worker process."""
+    global _GRAPH
+    init_llm()
+    _GRAPH = get_job_copilot_graph()
+
+
+def _get_graph() -> JobCopilotGraph:
+    """
+    Return the worker's workflow graph.
+
+    Initializes it on first use when worker_process_init did not run
+    (e.g. solo, threads or gevent pools, eager mode, or tasks called
+    directly in tests).
+    """
+    if _GRAPH is None:
+        _init_worker_graph()
+    return _GRAPH  # type: ignore[return-value]
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Run a coroutine on the worker's event loop and wait for its result.
+
+    Falls back to a throwaway loop when no worker loop was started
+    (e.g. eager mode or tasks called directly in tests).
+    """
+    if _worker_loop is None:
+        return asyncio.run(coro)
+
+    future = asyncio.run_coroutine_threadsafe(coro, _worker_loop)
+    try:
+        return future.result(timeout=app.conf.task_time_limit)
+    except BaseException:
+        # Soft time limit, timeout, etc. - don't leave the coroutine running
+        future.cancel()
+        raise
+
+
+# Upper bound on applications a single batched task runs concurrently
+BATCH_MAX_CONCURRENCY = 8
+
+
+def _export_result(result: dict[str, object], task_id: str, user_id: str | None) -> dict[str, object]:
+    """Build the exported task payload for a finished workflow state."""
+    exported = export_workflow_result(result)
+    exported["task_id"] = task_id
+    exported["user_id"] = user_id
+    exported["summary"] = get_summary(result)
+    exported["cached"] = False
+    return exported
+
+
+# Exported results of identical (job description, resume) pairs are reused
+# for as long as Celery keeps task results around
+RESULT_CACHE_PREFIX = "jc:cache:"
+
+
+def _result_cache_key(job_description: str, resume: str) -> str:
+    """Content-addressed cache key for a (job description, resume) pair."""
+    digest = hashlib.blake2b(
+        job_description.encode() + b"\x00" + resume.encode(),
+        digest_size=16,
+    ).hexdigest()
+    return f"{RESULT_CACHE_PREFIX}{digest}"
+
+
+def _get_cached_result(key: str) -> dict[str, object] | None:
+    """Return a previously exported result, or None on miss/cache error."""
+    try:
+        raw = app.backend.client.get(key)
+    except Exception as e:
+        logger.warning("Result cache lookup failed: %s", e)
+        return None
+    return orjson.loads(raw) if raw else None
+
+
+def _cache_result(key: str, exported: dict[str, object]) -> None:
+    """Store an exported result; failed workflows are never cached."""
+    if exported["metadata"]["error"]:
+        return
+    try:
+        app.backend.client.setex(key, app.conf.result_expires, orjson.dumps(exported))
+    except Exception as e:
+        logger.warning("Result cache write failed: %s", e)
+
+
+def _publish_stream_event(task_id: str, event: dict[str, object]) -> None:
+    """Publish one frame on the task's stream channel; never fails the task."""
+    try:
+        app.backend.client.publish(get_stream_channel(task_id), dump_for_json(event))
+    except Exception as e:
+        logger.warning("Failed to publish stream event for task %s: %s", task_id, e)
+
+
+# Per-task list of {"node": name, "update": state update} entries, one per
+# completed node in completion order, kept so a retried or redelivered task
+# resumes instead of starting over
+CHECKPOINT_PREFIX = "jc:ckpt:"
+
+
+def _save_checkpoint(task_id: str, node_name: str, node_output: dict[str, object]) -> None:
+    """Record a successfully completed node; never fails the task."""
+    if node_output.get("error"):
+        return
+    key = f"{CHECKPOINT_PREFIX}{task_id}"
+    try:
+        client = app.backend.client
+        client.rpush(key, dump_for_json({"node": node_name, "update": node_output}))
+        client.expire(key, app.conf.result_expires)
+    except Exception as e:
+        logger.warning("Failed to checkpoint node %s for task %s: %s", node_name, task_id, e)
+
+
+def _load_checkpoint(task_id: str) -> dict[str, object] | None:
+    """Rebuild a task's workflow state from its checkpointed node updates, if any."""
+    try:
+        saved = app.backend.client.lrange(f"{CHECKPOINT_PREFIX}{task_id}", 0, -1)
+    except Exception as e:
+        logger.warning("Failed to load checkpoint for task %s: %s", task_id, e)
+        return None
+    if not saved:
+        return None
+    state: dict[str, object] = {}
+    nodes_executed: list[str] = []
+    # Entries are replayed in the order the nodes completed
+    for raw in saved:
+        update = orjson.loads(raw)["update"]
+        nodes_executed += update.pop("nodes_executed", [])
+        state.update(update)
+    state["nodes_executed"] = nodes_executed
+    return state
+
+
+def _clear_checkpoint(task_id: str) -> None:
+    """Drop a task's checkpoint once its workflow has finished."""
+    try:
+        app.backend.client.delete(f"{CHECKPOINT_PREFIX}{task_id}")
+    except Exception as e:
+        logger.warning("Failed to clear checkpoint for task %s: %s", task_id, e)
+
+
+def _node_complete_callback(task_id: str) -> NodeCompleteCallback:
+    """Build a callback that checkpoints and publishes each node's output."""
+
+    async def on_node_complete(node_name: str, node_output: dict[str, object]) -> None:
+        _save_checkpoint(task_id, node_name, node_output)
+        _publish_stream_event(task_id, {"event": "node_complete", "node": node_name, "data": node_output})
+
+    return on_node_complete
+
 
 @app.task(
     name='job_copilot.analyze_application',
@@ -90,41 +286,58 @@ def analyze_application_task(
     task_id = self.request.id
 
     try:
-        logger.info(f"Starting task {task_id} for user {user_id}")
-
-        # Initialize LLM
-        init_llm()
-
-        # Get graph
-        graph = get_job_copilot_graph()
-
-        # Run workflow (need to handle async in sync task)
-        loop = asyncio.get_event_loop()
-        if loop.is_running():
-            # Already in async context
-            import nest_asyncio  # type: ignore[import-untyped]
-            nest_asyncio.apply()
-
-        result = loop.run_until_complete(
-            graph.execute(job_description=job_description, resume=resume)
+        logger.info("Starting task %s for user %s", task_id, user_id)
+
+        # Short-circuit identical inputs analyzed recently
+        cache_key = _result_cache_key(job_description, resume)
+        cached = _get_cached_result(cache_key)
+        if cached is not None:
+            logger.info("Task %s served from result cache", task_id)
+            _publish_stream_event(task_id, {"event": STREAM_END_EVENT, "error": None})
+            return {**cached, "task_id": task_id, "user_id": user_id, "cached": True}
+
+        graph = _get_graph()
+
+        # A retried or redelivered task (e.g. after a worker crash, which
+        # acks_late turns into a fresh delivery) picks up after the last
+        # node it completed; a first run simply finds no checkpoint
+        checkpoint = _load_checkpoint(task_id)
+
+        # Run workflow on the worker's persistent event loop, checkpointing
+        # and publishing each node's output as it completes
+        result = _run_coroutine(
+            graph.execute(
+                job_description=job_description,
+                resume=resume,
+                on_node_complete=_node_complete_callback(task_id),
+                resume_from=checkpoint,
+            )
         )
+        _clear_checkpoint(task_id)
 
         # Export results
-        exported = export_workflow_result(result)
-        exported["task_id"] = task_id
-        exported["user_id"] = user_id
-        exported["summary"] = get_summary(result)
-
-        logger.info(f"Task {task_id} completed with score: {result.get('matching_score'):.1%}")
+        exported = _export_result(result, task_id, user_id)
+        _cache_result(cache_key, exported)
+        _publish_stream_event(task_id, {"event": STREAM_END_EVENT, "error": result.get("error")})
+
+        if logger.isEnabledFor(logging.INFO):
+            score = result.get("matching_score")
+            logger.info(
+                "Task %s completed with score: %s",
+                task_id,
+                f"{score:.1%}" if score is not None else "n/a",
+            )
 
         return exported
 
     except SoftTimeLimitExceeded:
-        logger.warning(f"Task {task_id} hit soft time limit")
-        raise self.retry(exc=SoftTimeLimitExceeded(), countdown=30)
+        # Completed nodes are checkpointed, so the retry only has to finish
+        # the remaining ones and can start right away
+        logger.warning("Task %s hit soft time limit", task_id)
+        raise self.retry(exc=SoftTimeLimitExceeded(), countdown=1)
 
     except Exception as exc:
-        logger.error(f"Task {task_id} failed: {str(exc)}", exc_info=True)
+        logger.error("Task %s failed: %s", task_id, exc, exc_info=True)
 
         # Retry with exponential backoff
         retry_count = self.request.retries
@@ -133,7 +346,7 @@ def analyze_application_task(
         if self.request.retries < self.max_retries:
             raise self.retry(exc=exc, countdown=countdown)
         else:
-            logger.error(f"Task {task_id} exhausted retries")
+            logger.error("Task %s exhausted retries", task_id)
             return {
                 "task_id": task_id,
                 "user_id": user_id,
@@ -143,6 +356,98 @@ def analyze_application_task(
             }
 
 
+@app.task(
+    name='job_copilot.analyze_applications_batched',
+    bind=True,
+)
+def analyze_applications_batched_task(
+    self,
+    applications: list[dict[str, str]],
+) -> list[dict[str, object]]:
+    """
+    Analyze several applications inside a single task.
+
+    Instead of paying one worker round-trip and one sequential workflow run
+    per application, the whole list is executed through
+    ``JobCopilotGraph.execute_batch`` so the LLM calls of all applications
+    are in flight together.
+
+    Args:
+        applications: List of {"job_description": "...", "resume": "...", "user_id": "..."} dicts
+
+    Returns:
+        List of exported results, in the same order as ``applications``
+    """
+    task_id = self.request.id
+
+    logger.info("Starting batched task %s with %d applications", task_id, len(applications))
+
+    cache_keys = [
+        _result_cache_key(a.get("job_description", ""), a.get("resume", ""))
+        for a in applications
+    ]
+    exported: list[dict[str, object] | None] = []
+    for a, key in zip(applications, cache_keys):
+        cached = _get_cached_result(key)
+        exported.append(
+            None if cached is None
+            else {**cached, "task_id": task_id, "user_id": a.get("user_id"), "cached": True}
+        )
+
+    misses = [i for i, e in enumerate(exported) if e is None]
+    if misses:
+        graph = _get_graph()
+
+        pairs = [
+            (applications[i].get("job_description", ""), applications[i].get("resume", ""))
+            for i in misses
+        ]
+        try:
+            results = _run_coroutine(graph.execute_batch(pairs, max_concurrency=BATCH_MAX_CONCURRENCY))
+        except Exception as e:
+            # Sub-batches run as a chain; report the rows as failed rather
+            # than raising, so the sub-batches after this one still run
+            logger.error("Batched task %s failed: %s", task_id, e, exc_info=True)
+            error_msg = f"Workflow execution failed: {str(e)}"
+            results = [
+                {"job_description_raw": jd, "resume_raw": resume, "error": error_msg, "nodes_executed": []}
+                for jd, resume in pairs
+            ]
+
+        for i, result in zip(misses, results):
+            exported[i] = _export_result(result, task_id, applications[i].get("user_id"))
+            _cache_result(cache_keys[i], exported[i])
+
+    return exported  # type: ignore[return-value]
+
+
+def enqueue_sub_batches(sub_batches: list[list[dict[str, str]]]) -> list[str]:
+    """
+    Queue a batch as a chain of analyze_applications_batched_task, one per sub-batch.
+
+    Each sub-batch runs through ``JobCopilotGraph.execute_batch`` inside a
+    single task, and the chain starts a sub-batch only once the previous one
+    has finished, so at most one sub-batch's token budget is in flight.
+
+    Args:
+        sub_batches: Applications grouped into sub-batches, each a list of
+            {"job_description": "...", "resume": "...", "user_id": "..."} dicts
+
+    Returns:
+        Task ID of each sub-batch, in order
+    """
+    if not sub_batches:
+        return []
+    # IDs are assigned up front so every sub-batch can be polled, not only
+    # the last link the chain's AsyncResult points at
+    signatures = [
+        analyze_applications_batched_task.si(applications=rows).set(task_id=uuid())
+        for rows in sub_batches
+    ]
+    chain(*signatures).apply_async()
+    return [signature.options["task_id"] for signature in signatures]
+
+
 @app.task(
     name='job_copilot.batch_analyze',
     bind=True,
@@ -163,43 +468,93 @@ def batch_analyze_applications_task(
         Dictionary with batch results
     """
     task_id = self.request.id
-    results = []
 
-    logger.info(f"Starting batch task {task_id} with {len(applications)} applications")
+    logger.info("Starting batch task %s with %d applications", task_id, len(applications))
+
+    # Identical (job description, resume) pairs are analyzed once; every
+    # duplicate row points at the first row with the same inputs
+    seen: dict[tuple[str, str], int] = {}
+    canonical: list[int] = []
+    unique_apps: list[dict[str, str]] = []
+    for app in applications:
+        key = (app.get("job_description", ""), app.get("resume", ""))
+        if key not in seen:
+            seen[key] = len(unique_apps)
+            unique_apps.append(app)
+        canonical.append(seen[key])
+
+    # Enqueue every unique application in one group so the sends are
+    # published together and the batch gets a single GroupResult to poll
+    signature = group(
+        analyze_application_task.s(
+            job_description=app.get("job_description", ""),
+            resume=app.get("resume", ""),
+            user_id=app.get("user_id"),
+        )
+        for app in unique_apps
+    )
 
-    for i, app in enumerate(applications):
-        try:
-            # Queue individual analysis tasks
-            task = analyze_application_task.delay(
-                job_description=app.get("job_description", ""),
-                resume=app.get("resume", ""),
-                user_id=app.get("user_id"),
-            )
+    try:
+        group_result = signature.apply_async()
+    except Exception as e:
+        logger.error("Failed to queue batch %s: %s", batch_id, e)
+        return {
+            "batch_id": batch_id,
+            "task_id": task_id,
+            "group_id": None,
+            "task_ids": [],
+            "total_applications": len(applications),
+            "queued": 0,
+            "failed": len(applications),
+            "results": [
+                {
+                    "index": i,
+                    "user_id": app.get("user_id"),
+                    "status": "failed",
+                    "error": str(e),
+                }
+                for i, app in enumerate(applications)
+            ],
+        }
 
-            results.append({
-                "index": i,
-                "user_id": app.get("user_id"),
-                "task_id": task.id,
-                "status": "queued",
-            })
+    # The subtasks are already queued at this point, so a failed save only
+    # loses the GroupResult; rows stay queued and are polled by task ID
+    group_id = group_result.id
+    try:
+        group_result.save()
+    except Exception as e:
+        logger.warning("Failed to save group %s for batch %s: %s", group_id, batch_id, e)
+        group_id = None
 
-            logger.debug(f"Queued subtask {task.id} for user {app.get('user_id')}")
+    subtask_ids = [subtask.id for subtask in group_result.results]
+    first_index: dict[int, int] = {}
+    results = []
+    for i, (app, unique_index) in enumerate(zip(applications, canonical)):
+        entry = {
+            "index": i,
+            "user_id": app.get("user_id"),
+            "task_id": subtask_ids[unique_index],
+            "status": "queued",
+        }
+        if unique_index in first_index:
+            entry["dedup_of"] = first_index[unique_index]
+        else:
+            first_index[unique_index] = i
+        results.append(entry)
 
-        except Exception as e:
-            logger.error(f"Failed to queue task for application {i}: {str(e)}")
-            results.append({
-                "index": i,
-                "user_id": app.get("user_id"),
-                "status": "failed",
-                "error": str(e),
-            })
+    logger.debug(
+        "Queued group %s for batch %s (%d unique of %d)",
+        group_result.id, batch_id, len(unique_apps), len(applications),
+    )
 
     return {
         "batch_id": batch_id,
         "task_id": task_id,
+        "group_id": group_id,
+        "task_ids": [entry["task_id"] for entry in results],
         "total_applications": len(applications),
-        "queued": sum(1 for r in results if r["status"] == "queued"),
-        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "queued": len(results),
+        "failed": 0,
         "results": results,
     }
 
@@ -211,43 +566,81 @@ def batch_analyze_applications_task(
 def get_batch_results_task(
     _self,
     batch_id: str,
-    task_ids: list[str],
+    task_ids: list[str] | None = None,
+    group_id: str | None = None,
 ) -> dict[str, object]:
     """
     Get results for a batch of tasks.
 
     Args:
         batch_id: Batch identifier
-        task_ids: List of task IDs to retrieve
+        task_ids: List of task IDs to retrieve, one per batch row. Rows that
+            were deduplicated at enqueue time repeat the task ID of the row
+            they share a result with.
+        group_id: Group ID returned by batch_analyze_applications_task;
+            used to restore the subtasks when task_ids is not given
 
     Returns:
         Dictionary with combined results
     """
-    from celery.result import AsyncResult  # type: ignore[import-untyped]
+    from celery import states  # type: ignore[import-untyped]
+    from celery.result import GroupResult  # type: ignore[import-untyped]
+
+    ids: list[str] = list(task_ids or [])
+    if not ids and group_id:
+        group_result = GroupResult.restore(group_id, app=app)
+        if group_result is not None:
+            ids = [result.id for result in group_result.results]
+
+    # Fetch every distinct task's stored meta in a single round-trip
+    # instead of one backend GET per AsyncResult
+    distinct_ids = list(dict.fromkeys(ids))
+    raw_metas = app.backend.client.mget(
+        [app.backend.get_key_for_task(task_id) for task_id in distinct_ids]
+    ) if distinct_ids else []
+    metas = {
+        task_id: app.backend.decode_result(raw) if raw else None
+        for task_id, raw in zip(distinct_ids, raw_metas)
+    }
 
     results = []
     completed = 0
     failed = 0
     pending = 0
-
-    for task_id in task_ids:
-        result = AsyncResult(task_id, app=app)
-
-        if result.ready():
-            if result.successful():
-                results.append({
-                    "task_id": task_id,
-                    "status": "completed",
-                    "result": result.result,
-                })
+    first_index: dict[str, int] = {}
+
+    for index, task_id in enumerate(ids):
+        # Duplicate rows share the canonical row's outcome
+        if task_id in first_index:
+            canonical = first_index[task_id]
+            entry = {**results[canonical], "dedup_of": canonical}
+            results.append(entry)
+            if entry["status"] == "completed":
                 completed += 1
-            else:
-                results.append({
-                    "task_id": task_id,
-                    "status": "failed",
-                    "error": str(result.info),
-                })
+            elif entry["status"] == "failed":
                 failed += 1
+            else:
+                pending += 1
+            continue
+        first_index[task_id] = index
+
+        meta = metas[task_id]
+        status = meta["status"] if meta else states.PENDING
+
+        if status == states.SUCCESS:
+            results.append({
+                "task_id": task_id,
+                "status": "completed",
+                "result": meta["result"],
+            })
+            completed += 1
+        elif status in states.READY_STATES:
+            results.append({
+                "task_id": task_id,
+                "status": "failed",
+                "error": str(meta["result"]),
+            })
+            failed += 1
         else:
             results.append({
                 "task_id": task_id,
@@ -257,7 +650,7 @@ def get_batch_results_task(
 
     return {
         "batch_id": batch_id,
-        "total": len(task_ids),
+        "total": len(ids),
         "completed": completed,
         "failed": failed,
         "pending": pending,
@@ -285,21 +678,33 @@ def get_batch_results_task(
 # Health check and monitoring
 @app.task(name='job_copilot.health_check')
 def health_check_task() -> dict[str, object]:
-    """Health check task for monitoring."""
+    """
+    Health check task for monitoring.
+
+    Cheap enough to run as a frequent probe: the worker's graph is built
+    once, on the first probe if no worker_process_init ran, and the result
+    backend is pinged.
+    """
     try:
-        init_llm()
-        graph = get_job_copilot_graph()
-        return {
-            "status": "healthy",
-            "llm_ready": True,
-            "graph_ready": bool(graph),
-        }
+        ready = _get_graph() is not None
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+        logger.error("Worker graph failed to initialize: %s", e)
+        ready = False
+    try:
+        backend_ready = bool(app.backend.client.ping())
+    except Exception as e:
+        logger.error("Health check failed: %s", e)
         return {
             "status": "unhealthy",
+            "llm_ready": ready,
+            "graph_ready": ready,
             "error": str(e),
         }
+    return {
+        "status": "healthy" if ready and backend_ready else "unhealthy",
+        "llm_ready": ready,
+        "graph_ready": ready,
+    }
 
 
 # Usage examples:
@@ -319,9 +724,10 @@ def health_check_task() -> dict[str, object]:
 #    ...     {"job_description": "...", "resume": "...", "user_id": "user2"},
 #    ... ]
 #    >>> batch_task = batch_analyze_applications_task.delay(applications, batch_id="batch1")
+#    >>> task_ids = batch_task.get()["task_ids"]  # one per row, duplicates share an ID
 #
 # 3. Get batch results:
-#    >>> get_batch_results_task.delay(batch_id="batch1", task_ids=[...])
+#    >>> get_batch_results_task.delay(batch_id="batch1", task_ids=task_ids)
 #
 # 4. Check task status:
 #    >>> from celery.result import AsyncResult
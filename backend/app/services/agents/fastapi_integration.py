@@ -4,22 +4,87 @@ Example API endpoints for the agentic workflow.
 
 Integration into FastAPI app:
 1. Import this module in your main.py or routes
-2. Include the router in your FastAPI app
+2. Include the router in your FastAPI app; its lifespan initializes the
+   LLM and workflow graph when the app starts
 3. Ensure OPENAI_API_KEY is set in environment
 """
 
+import asyncio
 import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException
+import orjson
+from fastapi import APIRouter, BackgroundTasks, FastAPI, Header, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.services.agents import get_job_copilot_graph, init_llm
-from app.services.agents.utils import get_summary, validate_inputs
+from app.services.agents.celery_tasks import enqueue_sub_batches
+from app.services.agents.job_copilot_graph import GRAPH_STRUCTURE
+from app.services.agents.utils import (
+    MIN_INPUT_LENGTH,
+    NDJSON_MEDIA_TYPE,
+    STREAM_END_EVENT,
+    get_stream_channel,
+    get_summary,
+    stream_workflow_result,
+    validate_inputs,
+)
 
 logger = logging.getLogger(__name__)
 
+# Whether startup sends a one-token request to open the LLM connection pool
+# (set JC_WARMUP_LLM=0 to skip it, e.g. in tests or offline environments)
+WARMUP_LLM = os.getenv("JC_WARMUP_LLM", "1") != "0"
+
+# Longest startup waits for the warmup request (seconds); a slow or
+# unreachable LLM endpoint must not hold up the app
+WARMUP_TIMEOUT = float(os.getenv("JC_WARMUP_TIMEOUT", "5"))
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """Initialize the LLM and workflow graph, and warm the LLM client, on startup."""
+    try:
+        init_llm()
+        graph = get_job_copilot_graph()
+        logger.info("Job Copilot LLM and graph initialized on startup")
+        if WARMUP_LLM:
+            await asyncio.wait_for(graph.warmup(), timeout=WARMUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("LLM warmup did not finish within %.0fs; continuing startup", WARMUP_TIMEOUT)
+    except Exception as e:
+        logger.error("Failed to initialize Job Copilot on startup: %s", e)
+    yield
+
+
 # Create router
-router = APIRouter(prefix="/api/v1/job-copilot", tags=["Job Copilot"])
+router = APIRouter(
+    prefix="/api/v1/job-copilot",
+    tags=["Job Copilot"],
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Redis instance the Celery workers publish incremental results to
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Cap on workflows running concurrently in this process, and on how long
+# a single /analyze request may wait for its workflow (seconds)
+MAX_CONCURRENT_WORKFLOWS = int(os.getenv("JC_MAX_CONCURRENCY", "16"))
+WORKFLOW_TIMEOUT = float(os.getenv("JC_WORKFLOW_TIMEOUT", "30"))
+
+_workflow_semaphore = asyncio.Semaphore(MAX_CONCURRENT_WORKFLOWS)
+
+# Estimated input tokens admitted per batch sub-group; larger batches are
+# split rather than rejected (estimate: ~4 characters per token)
+MAX_BATCH_TOKENS = int(os.getenv("JC_MAX_BATCH_TOKENS", "32768"))
+CHARS_PER_TOKEN = 4
+
+# Most applications a single /batch-analyze request may carry
+MAX_BATCH_APPLICATIONS = int(os.getenv("JC_MAX_BATCH_APPLICATIONS", "50"))
 
 
 class JobApplicationRequest(BaseModel):
@@ -48,14 +113,41 @@ class HealthResponse(BaseModel):
     graph_initialized: bool
 
 
-@router.on_event("startup")
-async def startup_event():
-    """Initialize LLM on application startup."""
-    try:
-        init_llm()
-        logger.info("Job Copilot LLM initialized on startup")
-    except Exception as e:
-        logger.error(f"Failed to initialize LLM on startup: {str(e)}")
+# Static workflow documentation served by /docs/workflow
+WORKFLOW_DOCUMENTATION: dict[str, object] = {
+    "name": "Job Copilot",
+    "description": "Agentic workflow for job application analysis",
+    "nodes": [
+        {
+            "name": "parse_job_description",
+            "description": "Extract and structure job posting information",
+        },
+        {
+            "name": "parse_resume",
+            "description": "Extract and structure resume information (parallel with parse_job_description)",
+        },
+        {
+            "name": "analyze_resume",
+            "description": "Match resume against job requirements",
+        },
+        {
+            "name": "generate_cover_letter",
+            "description": "Create personalized cover letter (skipped for poor fits)",
+        },
+    ],
+    "inputs": {
+        "job_description": "Raw job posting text (minimum 50 characters)",
+        "resume": "Raw resume text (minimum 50 characters)",
+    },
+    "outputs": {
+        "matching_score": "Overall fit score (0-1)",
+        "job_title": "Extracted job title",
+        "company": "Extracted company name",
+        "cover_letter": "Generated cover letter (null when the matching score is below JC_COVER_LETTER_MIN_SCORE)",
+        "analysis_summary": "Detailed analysis with strengths, gaps, recommendations",
+    },
+    "typical_execution_time": "2-5 seconds (depends on LLM response time)",
+}
 
 
 @router.get("/health", response_model=HealthResponse)
@@ -74,7 +166,7 @@ async def health_check() -> HealthResponse:
             graph_initialized=bool(graph),
         )
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
+        logger.error("Health check failed: %s", e)
         return HealthResponse(
             status="unhealthy",
             llm_initialized=False,
@@ -83,7 +175,10 @@ async def health_check() -> HealthResponse:
 
 
 @router.post("/analyze", response_model=WorkflowExecutionResponse)
-async def analyze_job_application(request: JobApplicationRequest) -> WorkflowExecutionResponse:
+async def analyze_job_application(
+    request: JobApplicationRequest,
+    accept: str | None = Header(default=None),
+) -> WorkflowExecutionResponse | StreamingResponse:
     """
     Analyze a job posting and resume, generate a tailored cover letter.
 
@@ -91,9 +186,12 @@ async def analyze_job_application(request: JobApplicationRequest) -> WorkflowExe
 
     Args:
         request: Request containing job description and resume
+        accept: Accept header; ``application/x-ndjson`` streams the full
+            exported result as newline-delimited JSON instead
 
     Returns:
-        WorkflowExecutionResponse with analysis results
+        WorkflowExecutionResponse with analysis results, or the streamed
+        export when NDJSON was requested
 
     Raises:
         HTTPException: If validation fails or workflow execution fails
@@ -102,29 +200,41 @@ async def analyze_job_application(request: JobApplicationRequest) -> WorkflowExe
         # Validate inputs
         is_valid, error = validate_inputs(request.job_description, request.resume)
         if not is_valid:
-            logger.warning(f"Validation failed: {error}")
+            logger.warning("Validation failed: %s", error)
             raise HTTPException(status_code=400, detail=error)
 
-        logger.info(f"Processing job application (user: {request.user_id})")
+        logger.info("Processing job application (user: %s)", request.user_id)
 
         # Get graph and execute workflow
         try:
             graph = get_job_copilot_graph()
         except Exception as e:
-            logger.error(f"Failed to initialize graph: {str(e)}")
+            logger.error("Failed to initialize graph: %s", e)
             raise HTTPException(status_code=500, detail="Failed to initialize workflow engine")
 
-        # Execute workflow
-        result = await graph.execute(
-            job_description=request.job_description,
-            resume=request.resume,
-        )
+        # Execute workflow; the LLM calls are awaited, so other requests keep
+        # being served while this one waits on the network
+        try:
+            async with _workflow_semaphore:
+                result = await asyncio.wait_for(
+                    graph.execute(
+                        job_description=request.job_description,
+                        resume=request.resume,
+                    ),
+                    timeout=WORKFLOW_TIMEOUT,
+                )
+        except asyncio.TimeoutError:
+            logger.error("Workflow timed out after %ss (user: %s)", WORKFLOW_TIMEOUT, request.user_id)
+            raise HTTPException(status_code=504, detail="Workflow execution timed out")
 
         # Check for errors
         if result.get("error"):
-            logger.error(f"Workflow error: {result['error']}")
+            logger.error("Workflow error: %s", result["error"])
             raise HTTPException(status_code=500, detail=result["error"])
 
+        if accept and NDJSON_MEDIA_TYPE in accept:
+            return StreamingResponse(stream_workflow_result(result), media_type=NDJSON_MEDIA_TYPE)
+
         # Prepare response
         cover_letter = result.get("cover_letter", {})
         job_desc = result.get("job_description", {})
@@ -139,17 +249,59 @@ async def analyze_job_application(request: JobApplicationRequest) -> WorkflowExe
             execution_nodes=result.get("nodes_executed", []),
         )
 
-        logger.info(f"Job application analysis complete (score: {response.matching_score:.1%})")
+        if logger.isEnabledFor(logging.INFO):
+            score = response.matching_score
+            logger.info(
+                "Job application analysis complete (score: %s)",
+                f"{score:.1%}" if score is not None else "n/a",
+            )
 
         return response
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in analyze endpoint: {str(e)}", exc_info=True)
+        logger.error("Unexpected error in analyze endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get("/analyze/stream/{task_id}")
+async def stream_analysis(task_id: str) -> StreamingResponse:
+    """
+    Stream incremental results of a queued analysis as Server-Sent Events.
+
+    The Celery worker publishes each node's output as soon as the node
+    finishes, followed by a final "end" event. Events published before the
+    client subscribes are not replayed; fetch the task result for those.
+
+    Args:
+        task_id: Celery task ID returned when the analysis was queued
+
+    Returns:
+        text/event-stream response with one JSON frame per event
+    """
+    import redis.asyncio as aioredis
+
+    async def event_stream() -> AsyncIterator[bytes]:
+        client = aioredis.from_url(REDIS_URL)
+        pubsub = client.pubsub()
+        channel = get_stream_channel(task_id)
+        await pubsub.subscribe(channel)
+        try:
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                frame = message["data"]
+                yield b"data: " + frame + b"\n\n"
+                if orjson.loads(frame).get("event") == STREAM_END_EVENT:
+                    break
+        finally:
+            await pubsub.unsubscribe(channel)
+            await client.aclose()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/graph/structure")
 async def get_graph_structure() -> dict[str, object]:
     """
@@ -160,12 +312,7 @@ async def get_graph_structure() -> dict[str, object]:
     Returns:
         Dictionary describing graph structure
     """
-    try:
-        graph = get_job_copilot_graph()
-        return graph.get_graph_structure()
-    except Exception as e:
-        logger.error(f"Failed to get graph structure: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to retrieve graph structure")
+    return GRAPH_STRUCTURE
 
 
 @router.post("/batch-analyze")
@@ -174,12 +321,16 @@ async def batch_analyze_applications(
     _background_tasks: BackgroundTasks,
 ) -> dict[str, object]:
     """
-    Analyze multiple job applications in batch.
+    Queue multiple job applications for analysis.
 
-    For production use with Celery/Redis:
-    - Queue each application as a Celery task
-    - Return job IDs for polling
-    - Store results in cache/database
+    At most MAX_BATCH_APPLICATIONS applications are accepted per request.
+    Valid applications are packed into sub-batches of at most
+    MAX_BATCH_TOKENS estimated input tokens, and each sub-batch is queued
+    as one Celery task. The tasks are chained, so a sub-batch starts only
+    after the previous one has finished; no workflow runs inside the
+    request. Every queued
+    row reports the ``task_id`` of its sub-batch and its ``position`` in
+    that task's result list, to be polled through the Celery result backend.
 
     Args:
         applications: List of job applications to analyze
@@ -187,37 +338,91 @@ async def batch_analyze_applications(
 
     Returns:
         Dictionary with batch processing info
+
+    Raises:
+        HTTPException: If no or too many applications are given, or the
+            batch cannot be queued
     """
     if not applications:
         raise HTTPException(status_code=400, detail="No applications provided")
+    if len(applications) > MAX_BATCH_APPLICATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_BATCH_APPLICATIONS} applications per batch",
+        )
 
-    if len(applications) > 10:
-        raise HTTPException(status_code=400, detail="Maximum 10 applications per batch")
-
-    logger.info(f"Queuing batch analysis for {len(applications)} applications")
+    logger.info("Queuing batch analysis for %d applications", len(applications))
 
     results = []
+    failed = 0
+    # Valid applications, grouped by sub-batch, with the result entry of each
+    sub_batches: list[list[tuple[dict[str, object], JobApplicationRequest]]] = []
+    sub_batch_tokens = 0
 
     for app_request in applications:
-        # In production, use Celery:
-        # from tasks import analyze_application_task
-        # task = analyze_application_task.delay(
-        #     job_description=app_request.job_description,
-        #     resume=app_request.resume,
-        # )
-        # results.append({"id": app_request.user_id, "task_id": task.id})
-
-        # For now, just validate
-        is_valid, error = validate_inputs(app_request.job_description, app_request.resume)
-        if is_valid:
-            results.append({"id": app_request.user_id, "status": "queued"})
-        else:
+        # Inputs long enough are valid, so the full validator only runs to
+        # build the error message for the rest
+        jd_length = len(app_request.job_description)
+        resume_length = len(app_request.resume)
+        if jd_length < MIN_INPUT_LENGTH or resume_length < MIN_INPUT_LENGTH:
+            _, error = validate_inputs(app_request.job_description, app_request.resume)
             results.append({"id": app_request.user_id, "status": "failed", "error": error})
+            failed += 1
+            continue
+
+        tokens = (jd_length + resume_length) // CHARS_PER_TOKEN
+        if tokens > MAX_BATCH_TOKENS:
+            results.append({
+                "id": app_request.user_id,
+                "status": "failed",
+                "error": f"Application exceeds the batch budget of {MAX_BATCH_TOKENS} tokens",
+            })
+            failed += 1
+            continue
+
+        if not sub_batches or sub_batch_tokens + tokens > MAX_BATCH_TOKENS:
+            sub_batches.append([])
+            sub_batch_tokens = 0
+        sub_batch_tokens += tokens
+        entry: dict[str, object] = {
+            "id": app_request.user_id,
+            "status": "queued",
+            "sub_batch": len(sub_batches) - 1,
+            "position": len(sub_batches[-1]),
+        }
+        results.append(entry)
+        sub_batches[-1].append((entry, app_request))
+
+    task_ids: list[str] = []
+    if sub_batches:
+        payload = [
+            [
+                {
+                    "job_description": app_request.job_description,
+                    "resume": app_request.resume,
+                    "user_id": app_request.user_id,
+                }
+                for _, app_request in group
+            ]
+            for group in sub_batches
+        ]
+        try:
+            # Publishing talks to the broker, so keep it off the event loop
+            task_ids = await asyncio.to_thread(enqueue_sub_batches, payload)
+        except Exception as e:
+            logger.error("Failed to queue batch of %d applications: %s", len(applications), e)
+            raise HTTPException(status_code=503, detail="Failed to queue batch")
+
+        for group, task_id in zip(sub_batches, task_ids):
+            for entry, _ in group:
+                entry["task_id"] = task_id
 
     return {
         "total": len(applications),
-        "successful": sum(1 for r in results if r["status"] == "queued"),
-        "failed": sum(1 for r in results if r["status"] == "failed"),
+        "successful": len(results) - failed,
+        "failed": failed,
+        "sub_batches": len(sub_batches),
+        "task_ids": task_ids,
         "results": results,
     }
 
@@ -230,36 +435,7 @@ async def get_workflow_documentation() -> dict[str, object]:
     Returns:
         Dictionary with workflow documentation
     """
-    return {
-        "name": "Job Copilot",
-        "description": "Agentic workflow for job application analysis",
-        "nodes": [
-            {
-                "name": "parse_job_description",
-                "description": "Extract and structure job posting information",
-            },
-            {
-                "name": "analyze_resume",
-                "description": "Match resume against job requirements",
-            },
-            {
-                "name": "generate_cover_letter",
-                "description": "Create personalized cover letter",
-            },
-        ],
-        "inputs": {
-            "job_description": "Raw job posting text (minimum 50 characters)",
-            "resume": "Raw resume text (minimum 50 characters)",
-        },
-        "outputs": {
-            "matching_score": "Overall fit score (0-1)",
-            "job_title": "Extracted job title",
-            "company": "Extracted company name",
-            "cover_letter": "Generated cover letter",
-            "analysis_summary": "Detailed analysis with strengths, gaps, recommendations",
-        },
-        "typical_execution_time": "2-5 seconds (depends on LLM response time)",
-    }
+    return WORKFLOW_DOCUMENTATION
 
 
 # Optional: Include this in your FastAPI app
@@ -269,4 +445,4 @@ async def get_workflow_documentation() -> dict[str, object]:
 # from app.api.job_copilot import router as job_copilot_router
 #
 # app = FastAPI()
-# app.include_router(job_copilot_router)
+# app.include_router(job_copilot_router)  # also runs the router's lifespan
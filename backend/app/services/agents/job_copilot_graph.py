@@ -4,17 +4,72 @@ Defines the workflow graph with nodes, edges, and execution logic.
 """
 
 import logging
+import os
+from collections.abc import Awaitable, Callable
 
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 
+from .llm import get_llm
 from .nodes.analyze_resume import analyze_resume
-from .nodes.generate_cover_letter import generate_cover_letter
+from .nodes.generate_cover_letter import COVER_LETTER_PARTIAL_EVENT, generate_cover_letter
 from .nodes.parse_jd import parse_job_description
+from .nodes.parse_resume import parse_resume
 from .state import JobCopilotStateDict
 
 logger = logging.getLogger(__name__)
 
+# Applications scoring below this fit get no cover letter; generating one is
+# the most expensive call in the workflow and is unlikely to be used
+COVER_LETTER_MIN_SCORE = float(os.getenv("JC_COVER_LETTER_MIN_SCORE", "0.4"))
+
+# Callback invoked with (node_name, node_output) as each node finishes
+NodeCompleteCallback = Callable[[str, dict[str, object]], Awaitable[None]]
+
+
+# Static description of the workflow graph, built once at import
+GRAPH_STRUCTURE: dict[str, object] = {
+    "nodes": ["parse_job_description", "parse_resume", "analyze_resume", "generate_cover_letter"],
+    "edges": [
+        {"from": "START", "to": "parse_job_description"},
+        {"from": "START", "to": "parse_resume"},
+        {"from": "parse_job_description", "to": "analyze_resume"},
+        {"from": "parse_resume", "to": "analyze_resume"},
+        {"from": "analyze_resume", "to": "generate_cover_letter"},
+        {"from": "analyze_resume", "to": "END", "condition": "error or low matching score"},
+        {"from": "generate_cover_letter", "to": "END"},
+    ],
+    "description": "Parse JD and resume in parallel -> analyze resume -> generate cover letter (if a good enough fit)"
+}
+
+
+# Runs whose events stream_execution yields: the graph itself, each node and
+# the partial cover letters. Events of the prompts, models and parsers inside
+# the nodes are dropped before they reach the caller.
+STREAM_EVENT_NAMES: list[str] = ["LangGraph", *GRAPH_STRUCTURE["nodes"], COVER_LETTER_PARTIAL_EVENT]
+
+
+# Fields every workflow run starts without; copied into each initial state
+_EMPTY_STATE: JobCopilotStateDict = {
+    "job_description": None,
+    "resume_data": None,
+    "resume_analysis": None,
+    "skill_gaps": None,
+    "matching_score": None,
+    "cover_letter": None,
+    "error": None,
+}
+
+
+def _build_initial_state(job_description: str, resume: str) -> JobCopilotStateDict:
+    """Build the initial workflow state for a (job description, resume) pair."""
+    return {
+        **_EMPTY_STATE,
+        "job_description_raw": job_description,
+        "resume_raw": resume,
+        "nodes_executed": [],
+    }
+
 
 class JobCopilotGraph:
     """
@@ -23,8 +78,9 @@ class JobCopilotGraph:
     """
 
     def __init__(self):
-        """Initialize the graph."""
+        """Initialize and compile the graph."""
         self.graph = self._build_graph()
+        self._compiled = self.graph.compile()
         logger.info("JobCopilotGraph initialized")
 
     def _build_graph(self) -> StateGraph:
@@ -32,7 +88,14 @@ class JobCopilotGraph:
         Build the LangGraph workflow graph.
 
         Workflow:
-        START -> Parse Job Description -> Analyze Resume -> Generate Cover Letter -> END
+        START -> Parse Job Description -+-> Analyze Resume -> Generate Cover Letter -> END
+              -> Parse Resume ----------+         |
+                                                  +-> END (on error or low fit)
+
+        Both parsers run in the same step, so their LLM calls are in flight
+        concurrently; Analyze Resume runs once, after both have finished.
+        The graph ends after Analyze Resume once any node has set an error,
+        or when the matching score is below COVER_LETTER_MIN_SCORE.
 
         Returns:
             Constructed StateGraph
@@ -42,13 +105,24 @@ class JobCopilotGraph:
 
         # Add nodes
         workflow.add_node("parse_job_description", parse_job_description)
+        workflow.add_node("parse_resume", parse_resume)
         workflow.add_node("analyze_resume", analyze_resume)
         workflow.add_node("generate_cover_letter", generate_cover_letter)
 
-        # Define edges (workflow flow)
-        workflow.add_edge(START, "parse_job_description")
+        # Define edges (workflow flow). The entry is routed so that a run
+        # seeded from a checkpoint starts at its first unfinished nodes.
+        workflow.add_conditional_edges(
+            START,
+            _entry_nodes,
+            ["parse_job_description", "parse_resume", "analyze_resume", "generate_cover_letter", END],
+        )
         workflow.add_edge("parse_job_description", "analyze_resume")
-        workflow.add_edge("analyze_resume", "generate_cover_letter")
+        workflow.add_edge("parse_resume", "analyze_resume")
+        workflow.add_conditional_edges(
+            "analyze_resume",
+            _route_after_analysis,
+            ["generate_cover_letter", END],
+        )
         workflow.add_edge("generate_cover_letter", END)
 
         logger.debug("Graph workflow edges configured")
@@ -57,14 +131,26 @@ class JobCopilotGraph:
 
     @property
     def compiled_graph(self):
-        """Get the compiled graph ready for execution."""
-        return self.graph.compile()
+        """Get the compiled graph ready for execution (compiled once, in __init__)."""
+        return self._compiled
+
+    async def warmup(self) -> None:
+        """
+        Warm up the LLM client with a single-token request.
+
+        Opens the HTTP connection pool ahead of the first real workflow so
+        that request doesn't pay the connection setup cost.
+        """
+        await get_llm().bind(max_tokens=1).ainvoke("ping")
+        logger.info("LLM client warmed up")
 
     async def execute(
         self,
         job_description: str,
         resume: str,
         config: RunnableConfig | None = None,
+        on_node_complete: NodeCompleteCallback | None = None,
+        resume_from: dict[str, object] | None = None,
     ) -> dict[str, object]:
         """
         Execute the complete Job Copilot workflow.
@@ -73,35 +159,46 @@ class JobCopilotGraph:
             job_description: Raw job description text
             resume: Raw resume text
             config: Optional RunnableConfig for execution
+            on_node_complete: Optional async callback receiving each node's
+                output as soon as that node finishes
+            resume_from: Optional state checkpointed by an earlier, interrupted
+                run; nodes whose output it already holds are skipped
 
         Returns:
             Final state containing all workflow outputs
         """
         try:
             # Prepare initial state
-            initial_state: JobCopilotStateDict = {
-                "job_description_raw": job_description,
-                "resume_raw": resume,
-                "job_description": None,
-                "resume_data": None,
-                "resume_analysis": None,
-                "skill_gaps": None,
-                "matching_score": None,
-                "cover_letter": None,
-                "error": None,
-                "nodes_executed": [],
-            }
+            initial_state = _build_initial_state(job_description, resume)
+            if resume_from:
+                initial_state.update(resume_from)  # type: ignore[typeddict-item]
+                initial_state["job_description_raw"] = job_description
+                initial_state["resume_raw"] = resume
+                initial_state["error"] = None
+                logger.info("Resuming workflow after nodes: %s", initial_state["nodes_executed"])
 
             logger.info("Starting Job Copilot workflow execution")
-            logger.debug(f"Input resume length: {len(resume)} chars, JD length: {len(job_description)} chars")
+            logger.debug("Input resume length: %d chars, JD length: %d chars", len(resume), len(job_description))
 
             # Execute graph
             compiled = self.compiled_graph
-            final_state = await compiled.ainvoke(initial_state, config=config)
+            if on_node_complete is None:
+                final_state = await compiled.ainvoke(initial_state, config=config)
+            else:
+                final_state = initial_state
+                async for mode, chunk in compiled.astream(
+                    initial_state, config=config, stream_mode=["updates", "values"]
+                ):
+                    if mode == "values":
+                        final_state = chunk
+                        continue
+                    for node_name, node_output in chunk.items():
+                        await on_node_complete(node_name, node_output)
 
             logger.info(
-                f"Workflow completed. Nodes executed: {final_state.get('nodes_executed', [])}. "
-                f"Matching score: {final_state.get('matching_score')}"
+                "Workflow completed. Nodes executed: %s. Matching score: %s",
+                final_state.get("nodes_executed", []),
+                final_state.get("matching_score"),
             )
 
             return final_state
@@ -116,6 +213,60 @@ class JobCopilotGraph:
                 "nodes_executed": [],
             }
 
+    async def execute_batch(
+        self,
+        applications: list[tuple[str, str]],
+        config: RunnableConfig | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[dict[str, object]]:
+        """
+        Execute the workflow for several (job description, resume) pairs at once.
+
+        All pairs are submitted to the compiled graph in a single ``abatch``
+        call so their LLM requests are in flight together instead of one
+        application waiting on the previous one.
+
+        Args:
+            applications: List of (job_description, resume) tuples
+            config: Optional RunnableConfig applied to every run
+            max_concurrency: Optional cap on concurrently running workflows
+
+        Returns:
+            Final states, in the same order as ``applications``
+        """
+        if not applications:
+            return []
+
+        initial_states = [
+            _build_initial_state(job_description, resume)
+            for job_description, resume in applications
+        ]
+
+        batch_config: RunnableConfig = dict(config or {})  # type: ignore[assignment]
+        if max_concurrency is not None:
+            batch_config["max_concurrency"] = max_concurrency
+
+        logger.info("Starting batched workflow execution for %d applications", len(applications))
+
+        compiled = self.compiled_graph
+        outputs = await compiled.abatch(initial_states, config=batch_config, return_exceptions=True)
+
+        final_states: list[dict[str, object]] = []
+        for (job_description, resume), output in zip(applications, outputs):
+            if isinstance(output, Exception):
+                error_msg = f"Workflow execution failed: {str(output)}"
+                logger.error(error_msg)
+                final_states.append({
+                    "job_description_raw": job_description,
+                    "resume_raw": resume,
+                    "error": error_msg,
+                    "nodes_executed": [],
+                })
+            else:
+                final_states.append(output)
+
+        return final_states
+
     async def stream_execution(
         self,
         job_description: str,
@@ -131,28 +282,27 @@ class JobCopilotGraph:
             config: Optional RunnableConfig for execution
 
         Yields:
-            Streaming events during execution
+            Streaming events for the graph and its nodes (see
+            STREAM_EVENT_NAMES), including ``on_custom_event`` events named
+            ``cover_letter_partial`` whose data is the cover letter generated
+            so far
         """
         try:
-            initial_state: JobCopilotStateDict = {
-                "job_description_raw": job_description,
-                "resume_raw": resume,
-                "job_description": None,
-                "resume_data": None,
-                "resume_analysis": None,
-                "skill_gaps": None,
-                "matching_score": None,
-                "cover_letter": None,
-                "error": None,
-                "nodes_executed": [],
-            }
+            initial_state = _build_initial_state(job_description, resume)
 
             logger.info("Starting streaming workflow execution")
             compiled = self.compiled_graph
 
-            # Stream events
-            async for event in compiled.astream_events(initial_state, config=config, version="v2"):
-                logger.debug(f"Stream event: {event.get('event')} from {event.get('name')}")
+            # Stream events; checked once since this loop runs per token
+            debug = logger.isEnabledFor(logging.DEBUG)
+            async for event in compiled.astream_events(
+                initial_state,
+                config=config,
+                version="v2",
+                include_names=STREAM_EVENT_NAMES,
+            ):
+                if debug:
+                    logger.debug("Stream event: %s from %s", event.get("event"), event.get("name"))
                 yield event
 
         except Exception as e:
@@ -170,16 +320,30 @@ class JobCopilotGraph:
         Returns:
             Dictionary describing the graph structure
         """
-        return {
-            "nodes": ["parse_job_description", "analyze_resume", "generate_cover_letter"],
-            "edges": [
-                {"from": "START", "to": "parse_job_description"},
-                {"from": "parse_job_description", "to": "analyze_resume"},
-                {"from": "analyze_resume", "to": "generate_cover_letter"},
-                {"from": "generate_cover_letter", "to": "END"},
-            ],
-            "description": "Linear workflow: parse JD -> analyze resume -> generate cover letter"
-        }
+        return GRAPH_STRUCTURE
+
+
+def _entry_nodes(state: JobCopilotStateDict) -> list[str]:
+    """Pick the first nodes that have not already run for this state."""
+    executed = set(state.get("nodes_executed") or [])
+    parsers = [node for node in ("parse_job_description", "parse_resume") if node not in executed]
+    if parsers:
+        return parsers
+    for node in ("analyze_resume", "generate_cover_letter"):
+        if node not in executed:
+            return [node]
+    return [END]
+
+
+def _route_after_analysis(state: JobCopilotStateDict) -> str:
+    """End the run early if any node has failed or the resume is a poor fit."""
+    if state.get("error"):
+        return END
+    score = state.get("matching_score") or 0.0
+    if score < COVER_LETTER_MIN_SCORE:
+        logger.info("Skipping cover letter: matching score %.2f below %.2f", score, COVER_LETTER_MIN_SCORE)
+        return END
+    return "generate_cover_letter"
 
 
 # Singleton instance
@@ -3,8 +3,14 @@ LLM configuration and utilities for the Job Copilot agent.
 Handles LLM initialization and provides reusable components.
 """
 
+import asyncio
 import os
+import threading
+from collections.abc import Callable
+from typing import Any
 
+from langchain_core.caches import InMemoryCache
+from langchain_core.runnables import Runnable, RunnableConfig
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
@@ -17,6 +23,12 @@ class LLMConfig(BaseModel):
     max_tokens: int | None = Field(default=None)
     top_p: float = Field(default=1.0, ge=0.0, le=1.0)
     api_key: str | None = Field(default=None)
+    cache_size: int = Field(default=0, ge=0, description="Cached LLM responses; 0 disables caching")
+
+
+# Guards singleton creation and (re)initialization. Re-entrant because the
+# lazy getters call init() while holding it.
+_lock = threading.RLock()
 
 
 class LLMProvider:
@@ -25,44 +37,107 @@ class LLMProvider:
     Implements singleton pattern for efficient resource management.
     """
 
-    _instance: "LLMProvider" | None = None
+    _instance: "LLMProvider | None" = None
     _llm: ChatOpenAI | None = None
     _config: LLMConfig | None = None
+    _cache: InMemoryCache | None = None
+    _chains: dict[str, Runnable] = {}
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with _lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
 
+    @classmethod
+    def get_instance(cls) -> "LLMProvider":
+        """Get the singleton provider, creating it if needed."""
+        # Plain attribute read once created; only the first call takes the lock
+        instance = cls._instance
+        if instance is not None:
+            return instance
+        return cls()
+
+    @classmethod
+    def reset(cls) -> None:
+        """Drop the singleton so the next access creates a fresh provider."""
+        with _lock:
+            cls._instance = None
+
     def init(self, config: LLMConfig | None = None) -> None:
         """Initialize the LLM provider with configuration."""
+        with _lock:
+            self._init(config)
+
+    def _init(self, config: LLMConfig | None) -> None:
+        """Initialize without locking; callers must hold _lock."""
         if config is None:
             config = LLMConfig(
                 api_key=os.getenv("OPENAI_API_KEY"),
                 model_name=os.getenv("LLM_MODEL", "gpt-4-turbo"),
                 temperature=float(os.getenv("LLM_TEMPERATURE", 0.7)),
                 max_tokens=None,
+                cache_size=int(os.getenv("LLM_CACHE_SIZE", 0)),
             )
 
         self._config = config
+        # Chains are bound to the LLM instance, so rebuild them after re-init
+        self._chains = {}
+
+        # Identical prompts (e.g. the same job description parsed for many
+        # applicants) are answered from memory instead of the API. Off by
+        # default: above temperature 0 a cached reply replaces a fresh sample.
+        # The cache outlives re-initialization so reconfiguring keeps warm
+        # entries, and is dropped once caching is disabled.
+        if not config.cache_size:
+            self._cache = None
+        elif self._cache is None:
+            self._cache = InMemoryCache(maxsize=config.cache_size)
         self._llm = ChatOpenAI(
             model=config.model_name,
             temperature=config.temperature,
             max_tokens=config.max_tokens,
             top_p=config.top_p,
             api_key=config.api_key or os.getenv("OPENAI_API_KEY"),
+            cache=self._cache if self._cache is not None else False,
         )
 
     def get_llm(self) -> ChatOpenAI:
         """Get the LLM instance. Initialize if needed."""
         if self._llm is None:
-            self.init()
+            with _lock:
+                if self._llm is None:
+                    self._init(None)
         return self._llm
 
+    def get_chain(self, name: str, build: Callable[[ChatOpenAI], Runnable]) -> Runnable:
+        """
+        Get a named chain, building it once for the current LLM instance.
+
+        Args:
+            name: Chain identifier (e.g. the node name)
+            build: Builds the chain from the LLM on first use
+
+        Returns:
+            The memoized chain
+        """
+        llm = self.get_llm()
+        chain = self._chains.get(name)
+        if chain is None:
+            with _lock:
+                chain = self._chains.get(name)
+                if chain is None:
+                    chain = build(llm)
+                    self._chains[name] = chain
+        return chain
+
     def get_config(self) -> LLMConfig:
         """Get current LLM configuration."""
         if self._config is None:
-            self.init()
+            with _lock:
+                if self._config is None:
+                    self._init(None)
         return self._config
 
 
@@ -72,10 +147,65 @@ llm_provider = LLMProvider()
 
 def get_llm() -> ChatOpenAI:
     """Convenience function to get the current LLM instance."""
-    return llm_provider.get_llm()
+    return LLMProvider.get_instance().get_llm()
+
+
+def get_chain(name: str, build: Callable[[ChatOpenAI], Runnable]) -> Runnable:
+    """Convenience function to get a memoized chain from the current provider."""
+    return LLMProvider.get_instance().get_chain(name, build)
+
+
+# Chain calls currently in flight, keyed by event loop, name and inputs
+_inflight: dict[tuple[object, ...], asyncio.Future[Any]] = {}
+
+
+async def ainvoke_shared(
+    name: str,
+    chain: Runnable,
+    inputs: dict[str, Any],
+    config: RunnableConfig | None = None,
+) -> Any:
+    """
+    Invoke a chain, sharing one call among concurrent identical invocations.
+
+    Workflows running at the same time often send the same prompt (e.g. one
+    job description parsed for several candidates). The first caller starts
+    the request; callers with equal inputs await the same result instead of
+    issuing their own. Once the call finishes, later requests go through the
+    LLM response cache, if enabled.
+
+    The call runs with the first caller's config, so its callbacks, tags
+    and tracing see the run; callers that join it only receive the output.
+
+    Args:
+        name: Identifies the chain (e.g. the node name)
+        chain: Chain to invoke
+        inputs: Chain inputs; values must be hashable
+        config: Runnable config of the calling node, passed to the chain
+
+    Returns:
+        The chain's output
+    """
+    key = (asyncio.get_running_loop(), name, tuple(sorted(inputs.items())))
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(chain.ainvoke(inputs, config=config))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # A cancelled caller must not cancel the call other callers await
+    return await asyncio.shield(future)
 
 
 def init_llm(config: LLMConfig | None = None) -> ChatOpenAI:
-    """Initialize and return LLM instance."""
-    llm_provider.init(config)
-    return llm_provider.get_llm()
+    """
+    Initialize and return LLM instance.
+
+    This is the preload entry point: call it at process startup (the
+    router lifespan and the Celery worker init do) so the first request
+    doesn't pay for building the client. Without a config an already
+    initialized LLM is reused, so repeated calls build the client only once.
+    """
+    provider = LLMProvider.get_instance()
+    if config is not None:
+        provider.init(config)
+    return provider.get_llm()
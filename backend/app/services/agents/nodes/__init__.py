@@ -5,10 +5,13 @@ Agent Nodes - Individual components of the Job Copilot workflow.
 from .analyze_resume import ResumeAnalysis, analyze_resume
 from .generate_cover_letter import CoverLetterOutput, generate_cover_letter
 from .parse_jd import ParsedJobDescription, parse_job_description
+from .parse_resume import ParsedResume, parse_resume
 
 __all__ = [
     "parse_job_description",
     "ParsedJobDescription",
+    "parse_resume",
+    "ParsedResume",
     "analyze_resume",
     "ResumeAnalysis",
     "generate_cover_letter",
@@ -5,11 +5,12 @@ Analyzes resume against job description and identifies matching skills and gaps.
 
 import logging
 
-from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
-from ..llm import get_llm
+from ..llm import ainvoke_shared, get_chain
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +29,11 @@ class ResumeAnalysis(BaseModel):
     recommendations: list[str] = Field(description="Recommendations for application")
 
 
-RESUME_ANALYSIS_PROMPT = ChatPromptTemplate.from_template("""
-You are an expert recruiter and resume analyst. Analyze the following resume against the job description.
-
-Job Description:
-Title: {job_title}
-Company: {company}
-Requirements: {requirements}
-Nice to Have: {nice_to_have}
-
-Resume:
-{resume_raw}
+# Static instructions go in the system message and the job/resume data in
+# the user message, so every call shares the same cacheable prompt prefix
+RESUME_ANALYSIS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """
+You are an expert recruiter and resume analyst. Analyze the resume provided by the user against the job description.
 
 Provide a detailed analysis including:
 1. Skills from the resume that match the job requirements
@@ -50,81 +45,89 @@ Provide a detailed analysis including:
 7. Weaknesses or gaps to address
 8. Strategic recommendations for the application
 
-Provide the output as a valid JSON object:
-{{
-    "matched_skills": [...],
-    "missing_skills": [...],
-    "nice_to_have_matches": [...],
-    "experience_match": "...",
-    "experience_score": 0.8,
-    "skills_score": 0.75,
-    "overall_fit_score": 0.78,
-    "strengths": [...],
-    "weaknesses": [...],
-    "recommendations": [...]
-}}
-
 Be realistic and constructive in your analysis. Scores should reflect actual alignment.
-""")
+"""),
+    ("user", """Job Description:
+Title: {job_title}
+Company: {company}
+Requirements: {requirements}
+Nice to Have: {nice_to_have}
+
+Resume:
+{resume_raw}
+
+Skills listed on the resume: {resume_skills}"""),
+])
+
+
+def _build_chain(llm: ChatOpenAI) -> Runnable:
+    """Build the resume analysis chain for an LLM instance."""
+    return RESUME_ANALYSIS_PROMPT | llm.with_structured_output(ResumeAnalysis)
 
 
-async def analyze_resume(state: dict[str, object]) -> dict[str, object]:
+async def analyze_resume(
+    state: dict[str, object],
+    config: RunnableConfig | None = None,
+) -> dict[str, object]:
     """
     Analyze resume against job description.
 
     Args:
         state: Current workflow state
+        config: Runnable config supplied by the graph
 
     Returns:
-        Updated state with resume analysis
+        State update with resume analysis
     """
+    # Joins both parsers, so it still runs once when job description parsing
+    # failed; the graph ends right after it in that case
+    if state.get("error"):
+        return {}
+
     try:
         # Check prerequisites
-        job_description = state.get("job_description")
+        job_description = state["job_description"]
         resume_raw = state.get("resume_raw", "")
-
-        if not job_description:
-            state["error"] = "Job description must be parsed first"
-            logger.warning("analyze_resume: Missing job description")
-            return state
+        resume_data = state.get("resume_data")
 
         if not resume_raw:
-            state["error"] = "No resume provided"
             logger.warning("analyze_resume: Empty resume")
-            return state
-
-        # Initialize LLM and parser
-        llm = get_llm()
-        parser = JsonOutputParser(pydantic_object=ResumeAnalysis)
+            return {"error": "No resume provided"}
 
-        # Create chain
-        chain = RESUME_ANALYSIS_PROMPT | llm | parser
+        # Create chain; the model replies through OpenAI structured output,
+        # so the response always validates against ResumeAnalysis
+        chain = get_chain("analyze_resume", _build_chain)
 
         # Perform analysis
         logger.info("Analyzing resume against job description...")
-        analysis_result = await chain.ainvoke({
+        output = await ainvoke_shared("analyze_resume", chain, {
             "job_title": job_description.get("title", ""),
             "company": job_description.get("company", ""),
-            "requirements": ", ".join(job_description.get("requirements", [])),
-            "nice_to_have": ", ".join(job_description.get("nice_to_have", [])),
+            "requirements": job_description.get("requirements_str") or ", ".join(sorted(job_description.get("requirements", []))),
+            "nice_to_have": job_description.get("nice_to_have_str") or ", ".join(sorted(job_description.get("nice_to_have", []))),
             "resume_raw": resume_raw,
-        })
-
-        # Update state
-        state["resume_analysis"] = analysis_result
-        state["skill_gaps"] = analysis_result.get("missing_skills", [])
-        state["matching_score"] = analysis_result.get("overall_fit_score", 0.0)
-        state["nodes_executed"] = state.get("nodes_executed", []) + ["analyze_resume"]
-
-        logger.info(
-            f"Resume analysis complete. Overall fit: {state['matching_score']:.1%}. "
-            f"Matched skills: {len(analysis_result.get('matched_skills', []))}, "
-            f"Missing skills: {len(analysis_result.get('missing_skills', []))}"
-        )
+            "resume_skills": ", ".join(sorted(resume_data["skills"])) if resume_data else "(see resume)",
+        }, config=config)
+        analysis_result = output.model_dump()
+
+        matching_score = analysis_result.get("overall_fit_score", 0.0)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Resume analysis complete. Overall fit: %s. Matched skills: %d, Missing skills: %d",
+                f"{matching_score:.1%}",
+                len(analysis_result.get("matched_skills", [])),
+                len(analysis_result.get("missing_skills", [])),
+            )
+
+        return {
+            "resume_analysis": analysis_result,
+            "skill_gaps": analysis_result.get("missing_skills", []),
+            "matching_score": matching_score,
+            "nodes_executed": ["analyze_resume"],
+        }
 
     except Exception as e:
         error_msg = f"Error analyzing resume: {str(e)}"
         logger.error(error_msg, exc_info=True)
-        state["error"] = error_msg
-
-    return state
+        return {"error": error_msg}
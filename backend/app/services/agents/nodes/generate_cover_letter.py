@@ -5,11 +5,13 @@ Generates a tailored cover letter based on job description and resume analysis.
 
 import logging
 
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
-from ..llm import get_llm
+from ..llm import get_chain
 from ..state import CoverLetterData
 
 logger = logging.getLogger(__name__)
@@ -17,17 +19,40 @@ logger = logging.getLogger(__name__)
 
 class CoverLetterOutput(BaseModel):
     """Pydantic model for cover letter generation output."""
-    content: str = Field(description="Full cover letter content")
+    content: str = Field(description="Full cover letter content, from greeting to sign-off")
     tone: str = Field(description="Tone of the letter")
     highlighted_skills: list = Field(description="Key skills highlighted in the letter")
     key_achievements: list = Field(description="Achievements emphasized in the letter")
 
 
-COVER_LETTER_PROMPT = ChatPromptTemplate.from_template("""
+# Custom stream event carrying the partially generated cover letter
+COVER_LETTER_PARTIAL_EVENT = "cover_letter_partial"
+
+# Passing the schema as a dict makes the structured-output chain parse the
+# reply incrementally, so astream yields progressively filled dicts
+_COVER_LETTER_SCHEMA = CoverLetterOutput.model_json_schema()
+
+
+# Static instructions go in the system message and the candidate/job data
+# in the user message, so every call shares the same cacheable prompt prefix
+COVER_LETTER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """
 You are an expert cover letter writer and career coach. Generate a compelling,
-personalized cover letter based on the following information.
+personalized cover letter based on the information provided by the user.
 
-Candidate Information (from resume):
+Generate a professional cover letter that:
+1. Opens with a compelling hook showing genuine interest in the role
+2. Highlights 3-4 key matched skills with specific examples
+3. Addresses any skill gaps strategically (if any)
+4. Demonstrates knowledge of the company
+5. Includes quantifiable achievements and metrics
+6. Shows cultural fit and enthusiasm
+7. Ends with a strong call to action
+
+The letter should be 3-4 paragraphs, well-structured, and ready to use.
+Keep it to around 250-300 words.
+"""),
+    ("user", """Candidate Information (from resume):
 {resume_raw}
 
 Job Description:
@@ -40,81 +65,67 @@ Resume Analysis:
 - Matched Skills: {matched_skills}
 - Missing Skills: {missing_skills}
 - Key Strengths: {strengths}
-- Overall Fit Score: {overall_fit_score}%
+- Overall Fit Score: {overall_fit_score}%"""),
+])
 
-Generate a professional cover letter that:
-1. Opens with a compelling hook showing genuine interest in the role
-2. Highlights 3-4 key matched skills with specific examples
-3. Addresses any skill gaps strategically (if any)
-4. Demonstrates knowledge of the company
-5. Includes quantifiable achievements and metrics
-6. Shows cultural fit and enthusiasm
-7. Ends with a strong call to action
-
-Format the output as JSON:
-{{
-    "content": "Dear Hiring Manager,\\n\\n...[full letter]...\\n\\nBest regards",
-    "tone": "professional",
-    "highlighted_skills": ["skill1", "skill2", ...],
-    "key_achievements": ["achievement1", "achievement2", ...]
-}}
 
-The letter should be 3-4 paragraphs, well-structured, and ready to use.
-Keep it to around 250-300 words.
-""")
+def _build_chain(llm: ChatOpenAI) -> Runnable:
+    """Build the cover letter chain for an LLM instance."""
+    return COVER_LETTER_PROMPT | llm.with_structured_output(_COVER_LETTER_SCHEMA, method="json_schema")
 
 
-async def generate_cover_letter(state: dict[str, object]) -> dict[str, object]:
+async def generate_cover_letter(
+    state: dict[str, object],
+    config: RunnableConfig | None = None,
+) -> dict[str, object]:
     """
     Generate a tailored cover letter.
 
+    The letter is streamed from the model; every partial result is
+    dispatched as a ``cover_letter_partial`` custom event, which
+    ``JobCopilotGraph.stream_execution`` surfaces as ``on_custom_event``.
+
     Args:
         state: Current workflow state
+        config: Runnable config supplied by the graph
 
     Returns:
-        Updated state with generated cover letter
+        State update with generated cover letter
     """
     try:
-        # Check prerequisites
-        job_description = state.get("job_description")
+        # The graph only routes here when every earlier node succeeded
+        job_description = state["job_description"]
         resume_raw = state.get("resume_raw", "")
         resume_analysis = state.get("resume_analysis")
 
-        if not job_description:
-            state["error"] = "Job description must be parsed first"
-            logger.warning("generate_cover_letter: Missing job description")
-            return state
-
-        if not resume_raw:
-            state["error"] = "No resume provided"
-            logger.warning("generate_cover_letter: Empty resume")
-            return state
-
         if not resume_analysis:
-            state["error"] = "Resume analysis must be completed first"
             logger.warning("generate_cover_letter: Missing resume analysis")
-            return state
-
-        # Initialize LLM and parser
-        llm = get_llm()
-        parser = JsonOutputParser(pydantic_object=CoverLetterOutput)
+            return {"error": "Resume analysis must be completed first"}
 
-        # Create chain
-        chain = COVER_LETTER_PROMPT | llm | parser
+        # Create chain; the model replies through OpenAI structured output
+        # and the final result is validated against CoverLetterOutput
+        chain = get_chain("generate_cover_letter", _build_chain)
 
         # Generate cover letter
         logger.info("Generating tailored cover letter...")
-        cover_letter_result = await chain.ainvoke({
+        inputs = {
             "resume_raw": resume_raw,
             "job_title": job_description.get("title", ""),
             "company": job_description.get("company", ""),
             "job_description": job_description.get("description", ""),
-            "requirements": ", ".join(job_description.get("requirements", [])),
-            "matched_skills": ", ".join(resume_analysis.get("matched_skills", [])),
-            "missing_skills": ", ".join(resume_analysis.get("missing_skills", [])),
-            "strengths": ", ".join(resume_analysis.get("strengths", [])),
+            "requirements": job_description.get("requirements_str") or ", ".join(sorted(job_description.get("requirements", []))),
+            # Sorted so equal analyses produce identical prompts whatever
+            # order the model listed them in
+            "matched_skills": ", ".join(sorted(resume_analysis.get("matched_skills", []))),
+            "missing_skills": ", ".join(sorted(resume_analysis.get("missing_skills", []))),
+            "strengths": ", ".join(sorted(resume_analysis.get("strengths", []))),
             "overall_fit_score": int(resume_analysis.get("overall_fit_score", 0) * 100),
-        })
+        }
+        partial: dict[str, object] = {}
+        async for partial in chain.astream(inputs, config=config):
+            if config is not None:
+                await adispatch_custom_event(COVER_LETTER_PARTIAL_EVENT, partial, config=config)
+        cover_letter_result = CoverLetterOutput.model_validate(partial).model_dump()
 
         # Convert to CoverLetterData TypedDict
         cover_letter: CoverLetterData = {
@@ -124,18 +135,15 @@ async def generate_cover_letter(state: dict[str, object]) -> dict[str, object]:
             "key_achievements": cover_letter_result.get("key_achievements", []),
         }
 
-        state["cover_letter"] = cover_letter
-        state["nodes_executed"] = state.get("nodes_executed", []) + ["generate_cover_letter"]
-
         logger.info(
-            f"Cover letter generated successfully. "
-            f"Highlighted skills: {len(cover_letter['highlighted_skills'])}, "
-            f"Key achievements: {len(cover_letter['key_achievements'])}"
+            "Cover letter generated successfully. Highlighted skills: %d, Key achievements: %d",
+            len(cover_letter["highlighted_skills"]),
+            len(cover_letter["key_achievements"]),
         )
 
+        return {"cover_letter": cover_letter, "nodes_executed": ["generate_cover_letter"]}
+
     except Exception as e:
         error_msg = f"Error generating cover letter: {str(e)}"
         logger.error(error_msg, exc_info=True)
-        state["error"] = error_msg
-
-    return state
+        return {"error": error_msg}
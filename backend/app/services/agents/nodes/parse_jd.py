@@ -5,11 +5,12 @@ Extracts and structures information from raw job description text.
 
 import logging
 
-from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
-from ..llm import get_llm
+from ..llm import ainvoke_shared, get_chain
 from ..state import JobDescription
 
 logger = logging.getLogger(__name__)
@@ -28,13 +29,13 @@ class ParsedJobDescription(BaseModel):
     employment_type: str | None = Field(description="Full-time, contract, etc.")
 
 
-JOB_DESCRIPTION_PROMPT = ChatPromptTemplate.from_template("""
-You are an expert job description analyzer. Extract and structure the following job description.
+# Static instructions go in the system message and the job posting in the
+# user message, so every call shares the same cacheable prompt prefix
+JOB_DESCRIPTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """
+You are an expert job description analyzer. Extract and structure the job description provided by the user.
 Be thorough in identifying all requirements and separating them from nice-to-have skills.
 
-Job Description:
-{job_description_raw}
-
 Extract the following information:
 1. Job Title
 2. Company Name
@@ -46,74 +47,72 @@ Extract the following information:
 8. Seniority Level
 9. Employment Type
 
-Provide the output as a valid JSON object matching this structure:
-{{
-    "title": "...",
-    "company": "...",
-    "description": "...",
-    "requirements": [...],
-    "nice_to_have": [...],
-    "salary_range": "...",
-    "location": "...",
-    "seniority_level": "...",
-    "employment_type": "..."
-}}
-
 Important: Requirements and nice_to_have should be lists of individual items, not comma-separated strings.
-""")
+"""),
+    ("user", """Job Description:
+{job_description_raw}"""),
+])
+
 
+def _build_chain(llm: ChatOpenAI) -> Runnable:
+    """Build the job description parsing chain for an LLM instance."""
+    return JOB_DESCRIPTION_PROMPT | llm.with_structured_output(ParsedJobDescription)
 
-async def parse_job_description(state: dict[str, object]) -> dict[str, object]:
+
+async def parse_job_description(
+    state: dict[str, object],
+    config: RunnableConfig | None = None,
+) -> dict[str, object]:
     """
     Parse and structure job description.
 
     Args:
         state: Current workflow state
+        config: Runnable config supplied by the graph
 
     Returns:
-        Updated state with parsed job description
+        State update with parsed job description
     """
     try:
         job_description_raw = state.get("job_description_raw", "")
 
         if not job_description_raw:
-            state["error"] = "No job description provided"
             logger.warning("parse_job_description: Empty job description")
-            return state
-
-        # Initialize LLM and parser
-        llm = get_llm()
-        parser = JsonOutputParser(pydantic_object=ParsedJobDescription)
+            return {"error": "No job description provided"}
 
-        # Create chain
-        chain = JOB_DESCRIPTION_PROMPT | llm | parser
+        # Create chain; the model replies through OpenAI structured output,
+        # so the response always validates against ParsedJobDescription
+        chain = get_chain("parse_job_description", _build_chain)
 
         # Parse job description
         logger.info("Parsing job description...")
-        parsed_result = await chain.ainvoke({
+        output = await ainvoke_shared("parse_job_description", chain, {
             "job_description_raw": job_description_raw
-        })
+        }, config=config)
+        parsed_result = output.model_dump()
 
         # Convert to JobDescription TypedDict
+        requirements = parsed_result.get("requirements", [])
+        nice_to_have = parsed_result.get("nice_to_have", [])
         job_description: JobDescription = {
             "title": parsed_result.get("title", ""),
             "company": parsed_result.get("company", ""),
             "description": parsed_result.get("description", ""),
-            "requirements": parsed_result.get("requirements", []),
-            "nice_to_have": parsed_result.get("nice_to_have", []),
+            "requirements": requirements,
+            "nice_to_have": nice_to_have,
+            # Sorted so the same posting always yields the same prompt text
+            "requirements_str": ", ".join(sorted(requirements)),
+            "nice_to_have_str": ", ".join(sorted(nice_to_have)),
             "salary_range": parsed_result.get("salary_range"),
             "location": parsed_result.get("location"),
             "raw_text": job_description_raw,
         }
 
-        state["job_description"] = job_description
-        state["nodes_executed"] = state.get("nodes_executed", []) + ["parse_job_description"]
+        logger.info("Successfully parsed job description: %s at %s", job_description["title"], job_description["company"])
 
-        logger.info(f"Successfully parsed job description: {job_description['title']} at {job_description['company']}")
+        return {"job_description": job_description, "nodes_executed": ["parse_job_description"]}
 
     except Exception as e:
         error_msg = f"Error parsing job description: {str(e)}"
         logger.error(error_msg, exc_info=True)
-        state["error"] = error_msg
-
-    return state
+        return {"error": error_msg}
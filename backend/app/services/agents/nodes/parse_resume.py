@@ -0,0 +1,132 @@
+"""
+Resume Parser Node
+Extracts and structures information from raw resume text.
+Runs in parallel with job description parsing.
+"""
+
+import logging
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_openai import ChatOpenAI
+from pydantic import BaseModel, Field
+
+from ..llm import ainvoke_shared, get_chain
+from ..state import ResumeData
+
+logger = logging.getLogger(__name__)
+
+
+class ExperienceEntry(BaseModel):
+    """A single work experience entry."""
+    title: str = Field(description="Job title")
+    company: str = Field(description="Company name")
+    duration: str = Field(description="Time in the role, e.g. 2019-2022 or 3 years")
+    highlights: list[str] = Field(description="Key achievements in the role")
+
+
+class EducationEntry(BaseModel):
+    """A single education entry."""
+    degree: str = Field(description="Degree or qualification")
+    institution: str = Field(description="School or university")
+    year: str = Field(description="Graduation year")
+
+
+class ProjectEntry(BaseModel):
+    """A single project entry."""
+    name: str = Field(description="Project name")
+    description: str = Field(description="Short project description")
+
+
+class ParsedResume(BaseModel):
+    """Pydantic model for parsed resume output."""
+    name: str = Field(description="Candidate name")
+    email: str = Field(description="Candidate email address")
+    phone: str | None = Field(description="Candidate phone number")
+    experience: list[ExperienceEntry] = Field(description="Work experience entries")
+    skills: list[str] = Field(description="List of individual skills")
+    education: list[EducationEntry] = Field(description="Education entries")
+    projects: list[ProjectEntry] = Field(description="Notable projects")
+
+
+# Static instructions go in the system message and the resume in the user
+# message, so every call shares the same cacheable prompt prefix
+RESUME_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """
+You are an expert resume parser. Extract and structure the resume provided by the user.
+
+Extract the following information:
+1. Candidate Name
+2. Email
+3. Phone (if present)
+4. Work Experience (title, company, duration, key highlights for each role)
+5. Skills (list each separately)
+6. Education (degree, institution, year)
+7. Projects (name, short description)
+
+Important: Skills should be a list of individual items, not comma-separated strings.
+"""),
+    ("user", """Resume:
+{resume_raw}"""),
+])
+
+
+def _build_chain(llm: ChatOpenAI) -> Runnable:
+    """Build the resume parsing chain for an LLM instance."""
+    return RESUME_PROMPT | llm.with_structured_output(ParsedResume)
+
+
+async def parse_resume(
+    state: dict[str, object],
+    config: RunnableConfig | None = None,
+) -> dict[str, object]:
+    """
+    Parse and structure the resume.
+
+    Failures are not fatal: downstream nodes fall back to the raw resume
+    text when no structured resume data is available.
+
+    Args:
+        state: Current workflow state
+        config: Runnable config supplied by the graph
+
+    Returns:
+        State update with parsed resume data
+    """
+    resume_raw = state.get("resume_raw", "")
+
+    if not resume_raw:
+        logger.warning("parse_resume: Empty resume")
+        return {"nodes_executed": ["parse_resume"]}
+
+    try:
+        # Create chain; the model replies through OpenAI structured output,
+        # so the response always validates against ParsedResume
+        chain = get_chain("parse_resume", _build_chain)
+
+        # Parse resume
+        logger.info("Parsing resume...")
+        output = await ainvoke_shared("parse_resume", chain, {
+            "resume_raw": resume_raw
+        }, config=config)
+        parsed_result = output.model_dump()
+
+        # Convert to ResumeData TypedDict
+        resume_data: ResumeData = {
+            "name": parsed_result.get("name", ""),
+            "email": parsed_result.get("email", ""),
+            "phone": parsed_result.get("phone"),
+            "experience": parsed_result.get("experience", []),
+            "skills": parsed_result.get("skills", []),
+            "education": parsed_result.get("education", []),
+            "projects": parsed_result.get("projects", []),
+            "raw_text": resume_raw,
+        }
+
+        logger.info("Successfully parsed resume: %d skills", len(resume_data["skills"]))
+
+        return {"resume_data": resume_data, "nodes_executed": ["parse_resume"]}
+
+    except Exception as e:
+        logger.warning("Error parsing resume, continuing with raw text: %s", e)
+        return {"nodes_executed": ["parse_resume"]}
@@ -3,9 +3,10 @@ State schema for the Job Copilot agent workflow.
 Defines the shared state that flows through all agent nodes.
 """
 
+import operator
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import TypedDict
+from datetime import datetime, timezone
+from typing import Annotated, TypedDict
 
 
 class JobDescription(TypedDict):
@@ -15,6 +16,9 @@ class JobDescription(TypedDict):
     description: str
     requirements: list[str]
     nice_to_have: list[str]
+    # Comma-joined forms of the lists above, as fed to the downstream prompts
+    requirements_str: str
+    nice_to_have_str: str
     salary_range: str | None
     location: str | None
     raw_text: str
@@ -40,7 +44,7 @@ class CoverLetterData(TypedDict):
     key_achievements: list[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class JobCopilotState:
     """
     Main state for the Job Copilot agentic workflow.
@@ -63,13 +67,20 @@ class JobCopilotState:
     # Generated output
     cover_letter: CoverLetterData | None = None
 
-    # Metadata
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    # Metadata (ISO 8601 UTC; stamped lazily on first update or serialization)
+    created_at: str | None = None
+    updated_at: str | None = None
     error: str | None = None
 
     # Node execution tracking
     nodes_executed: list[str] = field(default_factory=list)
+
+    def update_timestamp(self) -> None:
+        """Stamp the state as updated now."""
+        self.updated_at = datetime.now(timezone.utc).isoformat()
+        if self.created_at is None:
+            self.created_at = self.updated_at
+
     def add_node_execution(self, node_name: str) -> None:
         """Track which nodes have been executed."""
         self.nodes_executed.append(node_name)
@@ -77,6 +88,8 @@ class JobCopilotState:
 
     def to_dict(self) -> dict[str, object]:
         """Convert state to dictionary for serialization."""
+        if self.created_at is None:
+            self.update_timestamp()
         return {
             "job_description_raw": self.job_description_raw,
             "resume_raw": self.resume_raw,
@@ -86,8 +99,8 @@ class JobCopilotState:
             "skill_gaps": self.skill_gaps,
             "matching_score": self.matching_score,
             "cover_letter": self.cover_letter,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
             "error": self.error,
             "nodes_executed": self.nodes_executed,
         }
@@ -105,4 +118,5 @@ class JobCopilotStateDict(TypedDict, total=False):
     matching_score: float | None
     cover_letter: CoverLetterData | None
     error: str | None
-    nodes_executed: list[str]
+    # Nodes return only the names they add; parallel branches are concatenated
+    nodes_executed: Annotated[list[str], operator.add]
@@ -2,7 +2,37 @@
 Utility functions for the Job Copilot agent system.
 """
 
+from collections import deque
+from collections.abc import AsyncIterator
 from datetime import datetime
+from itertools import chain, islice
+from typing import Any
+
+import orjson
+
+# Redis pub/sub channels carrying incremental workflow output, per task
+STREAM_CHANNEL_PREFIX = "jc:stream:"
+
+# Event name of the final frame published on a task's stream channel
+STREAM_END_EVENT = "end"
+
+
+def get_stream_channel(task_id: str) -> str:
+    """
+    Get the Redis pub/sub channel for a task's incremental output.
+
+    Args:
+        task_id: Celery task identifier
+
+    Returns:
+        Channel name
+    """
+    return f"{STREAM_CHANNEL_PREFIX}{task_id}"
+
+
+# Shared stand-ins for missing sub-dicts and lists; never mutated
+_EMPTY: dict[str, Any] = {}
+_NONE: tuple[()] = ()
 
 
 def format_cover_letter_for_display(cover_letter: dict[str, object]) -> str:
@@ -15,10 +45,10 @@ def format_cover_letter_for_display(cover_letter: dict[str, object]) -> str:
     Returns:
         Formatted cover letter text
     """
-    if not cover_letter or not cover_letter.get("content"):
+    if not cover_letter:
         return ""
 
-    return cover_letter["content"]
+    return cover_letter.get("content") or ""
 
 
 def export_workflow_result(result: dict[str, object]) -> dict[str, object]:
@@ -31,25 +61,29 @@ def export_workflow_result(result: dict[str, object]) -> dict[str, object]:
     Returns:
         Cleaned export-ready dictionary
     """
+    job_description = result.get("job_description") or _EMPTY
+    analysis = result.get("resume_analysis") or _EMPTY
+    cover_letter = result.get("cover_letter") or _EMPTY
+
     return {
         "job_description": {
-            "title": result.get("job_description", {}).get("title"),
-            "company": result.get("job_description", {}).get("company"),
-            "location": result.get("job_description", {}).get("location"),
-            "salary_range": result.get("job_description", {}).get("salary_range"),
-            "requirements_count": len(result.get("job_description", {}).get("requirements", [])),
+            "title": job_description.get("title"),
+            "company": job_description.get("company"),
+            "location": job_description.get("location"),
+            "salary_range": job_description.get("salary_range"),
+            "requirements_count": len(job_description.get("requirements") or _NONE),
         },
         "analysis": {
             "overall_fit_score": result.get("matching_score"),
-            "matched_skills_count": len(result.get("resume_analysis", {}).get("matched_skills", [])),
-            "missing_skills_count": len(result.get("resume_analysis", {}).get("missing_skills", [])),
-            "experience_score": result.get("resume_analysis", {}).get("experience_score"),
-            "skills_score": result.get("resume_analysis", {}).get("skills_score"),
+            "matched_skills_count": len(analysis.get("matched_skills") or _NONE),
+            "missing_skills_count": len(analysis.get("missing_skills") or _NONE),
+            "experience_score": analysis.get("experience_score"),
+            "skills_score": analysis.get("skills_score"),
         },
         "cover_letter": {
-            "content": result.get("cover_letter", {}).get("content"),
-            "tone": result.get("cover_letter", {}).get("tone"),
-            "highlighted_skills_count": len(result.get("cover_letter", {}).get("highlighted_skills", [])),
+            "content": cover_letter.get("content"),
+            "tone": cover_letter.get("tone"),
+            "highlighted_skills_count": len(cover_letter.get("highlighted_skills") or _NONE),
         },
         "metadata": {
             "nodes_executed": result.get("nodes_executed", []),
@@ -58,6 +92,33 @@ def export_workflow_result(result: dict[str, object]) -> dict[str, object]:
     }
 
 
+def _pct(score: float | None) -> str:
+    """Format a 0-1 score as a percentage with one decimal; None reads as 0."""
+    return f"{score or 0:.1%}"
+
+
+# Media type of the newline-delimited JSON export
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+async def stream_workflow_result(result: dict[str, object]) -> AsyncIterator[bytes]:
+    """
+    Stream the exported workflow result as newline-delimited JSON.
+
+    Each top-level section of ``export_workflow_result`` (job description,
+    analysis, cover letter, metadata) is encoded and sent as its own line,
+    so the client starts receiving data before the whole body is encoded.
+
+    Args:
+        result: Complete workflow state
+
+    Yields:
+        One encoded ``{section: data}`` line per section
+    """
+    for section, data in export_workflow_result(result).items():
+        yield orjson.dumps({section: data}, option=orjson.OPT_APPEND_NEWLINE)
+
+
 def get_summary(result: dict[str, object]) -> dict[str, object]:
     """
     Generate a summary of workflow execution.
@@ -68,26 +129,34 @@ def get_summary(result: dict[str, object]) -> dict[str, object]:
     Returns:
         Summary dictionary
     """
-    analysis = result.get("resume_analysis", {})
+    job_description = result.get("job_description") or _EMPTY
+    analysis = result.get("resume_analysis") or _EMPTY
 
     return {
         "job": {
-            "title": result.get("job_description", {}).get("title"),
-            "company": result.get("job_description", {}).get("company"),
+            "title": job_description.get("title"),
+            "company": job_description.get("company"),
         },
         "fit_assessment": {
-            "overall_score": f"{result.get('matching_score', 0):.1%}",
-            "skills_alignment": f"{analysis.get('skills_score', 0):.1%}",
-            "experience_alignment": f"{analysis.get('experience_score', 0):.1%}",
+            "overall_score": _pct(result.get("matching_score")),
+            "skills_alignment": _pct(analysis.get("skills_score")),
+            "experience_alignment": _pct(analysis.get("experience_score")),
         },
         "matched_skills": analysis.get("matched_skills", []),
         "missing_skills": analysis.get("missing_skills", []),
-        "key_strengths": analysis.get("strengths", [])[:3],
-        "recommendations": analysis.get("recommendations", [])[:3],
+        "key_strengths": list(islice(analysis.get("strengths") or _NONE, 3)),
+        "recommendations": list(islice(analysis.get("recommendations") or _NONE, 3)),
         "cover_letter_ready": bool(result.get("cover_letter")),
     }
 
 
+# Minimum length, in characters, of a job description or resume
+MIN_INPUT_LENGTH = 50
+
+_JOB_DESCRIPTION_TOO_SHORT = f"Job description must be at least {MIN_INPUT_LENGTH} characters"
+_RESUME_TOO_SHORT = f"Resume must be at least {MIN_INPUT_LENGTH} characters"
+
+
 def validate_inputs(job_description: str, resume: str) -> tuple[bool, str | None]:
     """
     Validate workflow inputs.
@@ -99,42 +168,108 @@ def validate_inputs(job_description: str, resume: str) -> tuple[bool, str | None
     Returns:
         Tuple of (is_valid, error_message)
     """
-    min_length = 50
-
-    if not job_description:
-        return False, "Job description is required"
+    # One length probe per input; an empty (or None) input has length 0
+    job_description_length = len(job_description) if job_description else 0
+    if job_description_length < MIN_INPUT_LENGTH:
+        if job_description_length == 0:
+            return False, "Job description is required"
+        return False, _JOB_DESCRIPTION_TOO_SHORT
+
+    resume_length = len(resume) if resume else 0
+    if resume_length < MIN_INPUT_LENGTH:
+        if resume_length == 0:
+            return False, "Resume is required"
+        return False, _RESUME_TOO_SHORT
 
-    if not resume:
-        return False, "Resume is required"
+    return True, None
 
-    if len(job_description) < min_length:
-        return False, f"Job description must be at least {min_length} characters"
 
-    if len(resume) < min_length:
-        return False, f"Resume must be at least {min_length} characters"
+# Leaf types format_for_json passes through unchanged
+_JSON_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
 
-    return True, None
+# Deepest container nesting format_for_json accepts; guards against
+# adversarial input and self-referencing containers
+MAX_NESTING_DEPTH = 256
 
 
 def format_for_json(obj: object) -> object:
     """
-    Recursively format objects for JSON serialization.
+    Format objects for JSON serialization.
+
+    Walks nested dicts, lists and tuples with an explicit stack rather than
+    recursion, so no call frame is paid per element.
 
     Args:
         obj: Object to format
 
     Returns:
         JSON-serializable object
+
+    Raises:
+        ValueError: If containers are nested deeper than MAX_NESTING_DEPTH
+            (which includes circular references)
     """
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {k: format_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [format_for_json(item) for item in obj]
-    else:
+    if type(obj) in _JSON_SCALAR_TYPES:
         return obj
 
+    # Each frame is (output container, key or index, input value, depth);
+    # the root is written into a one-element list
+    root: list[object] = [None]
+    stack: deque[tuple[Any, Any, object, int]] = deque([(root, 0, obj, 0)])
+    while stack:
+        parent, slot, value, depth = stack.pop()
+        value_type = type(value)
+        if value_type in _JSON_SCALAR_TYPES:
+            parent[slot] = value
+        elif value_type is dict or isinstance(value, dict):
+            if depth >= MAX_NESTING_DEPTH:
+                raise ValueError(f"Nesting exceeds maximum depth of {MAX_NESTING_DEPTH}")
+            # Pre-seed keys so the output keeps the input's key order
+            out = dict.fromkeys(value)
+            parent[slot] = out
+            depth += 1
+            stack.extend((out, k, v, depth) for k, v in value.items())
+        elif value_type is list or value_type is tuple or isinstance(value, (list, tuple)):
+            if depth >= MAX_NESTING_DEPTH:
+                raise ValueError(f"Nesting exceeds maximum depth of {MAX_NESTING_DEPTH}")
+            # Flat lists of scalars (skills, requirements, ...) are the
+            # common case and are copied in one go
+            if all(type(v) in _JSON_SCALAR_TYPES for v in value):
+                parent[slot] = list(value)
+                continue
+            out = [None] * len(value)
+            parent[slot] = out
+            depth += 1
+            stack.extend((out, i, v, depth) for i, v in enumerate(value))
+        elif isinstance(value, datetime):
+            parent[slot] = value.isoformat()
+        else:
+            parent[slot] = value
+    return root[0]
+
+
+def dump_for_json(obj: object) -> bytes:
+    """
+    Serialize an object straight to JSON bytes.
+
+    orjson handles datetimes, tuples and nesting natively, so no
+    intermediate copy is built as with ``format_for_json``. Non-string
+    dict keys are converted to strings, as ``json.dumps`` does. Unlike
+    ``format_for_json``, integers beyond 64 bits and types orjson cannot
+    serialize raise instead of being passed through.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        UTF-8 encoded JSON
+
+    Raises:
+        orjson.JSONEncodeError: If obj holds an integer beyond 64 bits or
+            an unsupported type
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
 
 def merge_results(result1: dict[str, object], result2: dict[str, object]) -> dict[str, object]:
     """
@@ -147,15 +282,21 @@ def merge_results(result1: dict[str, object], result2: dict[str, object]) -> dic
     Returns:
         Merged results
     """
-    merged = result1.copy()
-
-    # Extend nodes_executed
-    merged["nodes_executed"] = list(
-        set(result1.get("nodes_executed", []) + result2.get("nodes_executed", []))
-    )
-
-    # Keep first result as primary, note alternate
-    if result2.get("error") and not result1.get("error"):
-        merged["alternate_error"] = result2["error"]
+    # Later results win key by key; the merge runs entirely in C
+    merged = result1 | result2
+
+    # Extend nodes_executed, dropping duplicates but keeping execution order
+    if "nodes_executed" in merged:
+        merged["nodes_executed"] = list(
+            dict.fromkeys(chain(result1.get("nodes_executed", _NONE), result2.get("nodes_executed", _NONE)))
+        )
+
+    # When both results have an error key, result1's error stays primary and
+    # result2's is noted as alternate_error only if result1's is falsy and
+    # result2's is truthy. Without a key in result1, the union keeps result2's
+    if "error" in result1 and "error" in result2:
+        merged["error"] = result1["error"]
+        if result2["error"] and not merged["error"]:
+            merged["alternate_error"] = result2["error"]
 
     return merged
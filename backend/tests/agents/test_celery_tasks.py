@@ -0,0 +1,438 @@
+"""Tests for Job Copilot Celery tasks."""
+
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from celery.backends.base import DisabledBackend
+
+from app.services.agents import celery_tasks
+
+
+class FakeRedis:
+    """In-memory stand-in for the result backend's Redis client."""
+
+    def __init__(self):
+        self.data: dict[str, object] = {}
+        self.ttl: dict[str, int] = {}
+        self.published: list[tuple[str, bytes]] = []
+
+    def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [self.data.get(key) for key in keys]
+
+    def setex(self, key: str, ttl: int, value: bytes) -> None:
+        self.data[key] = value
+        self.ttl[key] = ttl
+
+    def rpush(self, key: str, value: bytes) -> None:
+        self.data.setdefault(key, []).append(value)
+
+    def lrange(self, key: str, _start: int, _end: int) -> list[bytes]:
+        return list(self.data.get(key, []))
+
+    def expire(self, key: str, ttl: int) -> None:
+        self.ttl[key] = ttl
+
+    def delete(self, key: str) -> None:
+        self.data.pop(key, None)
+
+    def publish(self, channel: str, message: bytes) -> None:
+        self.published.append((channel, message))
+
+    def ping(self) -> bool:
+        return True
+
+
+class FakeBackend(DisabledBackend):
+    """Result backend exposing a FakeRedis client."""
+
+    def __init__(self):
+        super().__init__(app=celery_tasks.app)
+        self.client = FakeRedis()
+
+    def get_key_for_task(self, task_id: str, key: str = "") -> str:
+        return f"celery-task-meta-{task_id}"
+
+    def decode_result(self, payload: bytes) -> dict[str, object]:
+        return orjson.loads(payload)
+
+    def store_meta(self, task_id: str, status: str, result: object) -> None:
+        """Store a task meta the way the Redis result backend would."""
+        self.client.data[self.get_key_for_task(task_id)] = orjson.dumps({"status": status, "result": result})
+
+
+class FakeGraph:
+    """Stand-in for JobCopilotGraph that records how it was executed."""
+
+    def __init__(self):
+        self.executions: list[dict[str, object]] = []
+        self.batches: list[list[tuple[str, str]]] = []
+        self.running_batches = 0
+        self.peak_batches = 0
+        self.error: str | None = None
+
+    async def execute_batch(self, applications: list[tuple[str, str]], **_kwargs: object) -> list[dict[str, object]]:
+        self.batches.append(applications)
+        self.running_batches += 1
+        self.peak_batches = max(self.peak_batches, self.running_batches)
+        try:
+            return [await self.execute(job_description, resume) for job_description, resume in applications]
+        finally:
+            self.running_batches -= 1
+
+    async def execute(self, job_description: str, resume: str, **kwargs: object) -> dict[str, object]:
+        self.executions.append(kwargs)
+        return {
+            "job_description_raw": job_description,
+            "resume_raw": resume,
+            "job_description": {"title": "Backend Engineer", "company": "TechCorp"},
+            "resume_analysis": {"skills_score": 0.9, "experience_score": 0.8},
+            "matching_score": 0.85,
+            "cover_letter": {"content": "Dear Hiring Manager...", "tone": "professional"},
+            "nodes_executed": ["parse_job_description", "parse_resume", "analyze_resume", "generate_cover_letter"],
+            "error": self.error,
+        }
+
+
+@pytest.fixture
+def backend(monkeypatch: pytest.MonkeyPatch) -> FakeBackend:
+    """Point the Celery app at an in-memory result backend."""
+    fake = FakeBackend()
+    monkeypatch.setattr(celery_tasks.app._local, "backend", fake, raising=False)
+    return fake
+
+
+@pytest.fixture
+def graph(monkeypatch: pytest.MonkeyPatch) -> FakeGraph:
+    """Serve the tasks' workflows from a FakeGraph."""
+    fake = FakeGraph()
+    monkeypatch.setattr(celery_tasks, "_get_graph", lambda: fake)
+    return fake
+
+
+class TestCheckpoints:
+    """Test per-node checkpointing of task progress."""
+
+    def test_checkpoint_round_trip_keeps_completion_order(self, backend: FakeBackend):
+        """Test that loaded checkpoints replay node updates in completion order."""
+        celery_tasks._save_checkpoint("t1", "parse_resume", {"resume_data": {"name": "John"}, "nodes_executed": ["parse_resume"]})
+        celery_tasks._save_checkpoint("t1", "parse_job_description", {"job_description": {"title": "Dev"}, "nodes_executed": ["parse_job_description"]})
+
+        state = celery_tasks._load_checkpoint("t1")
+
+        assert state == {
+            "resume_data": {"name": "John"},
+            "job_description": {"title": "Dev"},
+            "nodes_executed": ["parse_resume", "parse_job_description"],
+        }
+        assert backend.client.ttl[f"{celery_tasks.CHECKPOINT_PREFIX}t1"] == celery_tasks.app.conf.result_expires
+
+    def test_failed_node_is_not_checkpointed(self, backend: FakeBackend):
+        """Test that a node update carrying an error is not saved."""
+        celery_tasks._save_checkpoint("t1", "parse_job_description", {"error": "boom", "nodes_executed": ["parse_job_description"]})
+
+        assert celery_tasks._load_checkpoint("t1") is None
+
+    def test_clear_checkpoint(self, backend: FakeBackend):
+        """Test that clearing drops every saved node."""
+        celery_tasks._save_checkpoint("t1", "parse_resume", {"nodes_executed": ["parse_resume"]})
+
+        celery_tasks._clear_checkpoint("t1")
+
+        assert celery_tasks._load_checkpoint("t1") is None
+
+    def test_first_delivery_resumes_from_checkpoint(self, backend: FakeBackend, graph: FakeGraph):
+        """Test that a redelivered task (retries == 0) resumes and then clears its checkpoint."""
+        celery_tasks._save_checkpoint("t1", "parse_job_description", {"job_description": {"title": "Dev"}, "nodes_executed": ["parse_job_description"]})
+
+        result = celery_tasks.analyze_application_task.apply(
+            kwargs={"job_description": "JD", "resume": "Resume"},
+            task_id="t1",
+        ).get()
+
+        assert graph.executions[0]["resume_from"] == {
+            "job_description": {"title": "Dev"},
+            "nodes_executed": ["parse_job_description"],
+        }
+        assert celery_tasks._load_checkpoint("t1") is None
+        assert result["task_id"] == "t1"
+
+    def test_fresh_task_starts_without_checkpoint(self, backend: FakeBackend, graph: FakeGraph):
+        """Test that a task with nothing checkpointed runs the whole workflow."""
+        celery_tasks.analyze_application_task.apply(
+            kwargs={"job_description": "JD", "resume": "Resume"},
+            task_id="t2",
+        ).get()
+
+        assert graph.executions[0]["resume_from"] is None
+
+
+class TestResultCache:
+    """Test the content-addressed cache of exported results."""
+
+    def run_task(self, task_id: str, user_id: str | None = None) -> dict[str, object]:
+        """Run analyze_application_task eagerly on fixed inputs."""
+        return celery_tasks.analyze_application_task.apply(
+            kwargs={"job_description": "JD", "resume": "Resume", "user_id": user_id},
+            task_id=task_id,
+        ).get()
+
+    def test_miss_stores_result_with_ttl(self, backend: FakeBackend, graph: FakeGraph):
+        """Test that a cache miss runs the workflow and caches its export."""
+        result = self.run_task("t1", "user-1")
+
+        key = celery_tasks._result_cache_key("JD", "Resume")
+        assert len(graph.executions) == 1
+        assert backend.client.ttl[key] == celery_tasks.app.conf.result_expires
+        assert orjson.loads(backend.client.data[key]) == result
+        assert result["cached"] is False
+
+    def test_hit_returns_cached_result_for_caller(self, backend: FakeBackend, graph: FakeGraph):
+        """Test that a hit skips the workflow and carries the caller's ids."""
+        first = self.run_task("t1", "user-1")
+
+        result = self.run_task("t2", "user-2")
+
+        assert len(graph.executions) == 1
+        assert result["cached"] is True
+        assert result["task_id"] == "t2"
+        assert result["user_id"] == "user-2"
+        assert result["analysis"] == first["analysis"]
+
+    def test_failed_workflow_is_not_cached(self, backend: FakeBackend, graph: FakeGraph):
+        """Test that an export carrying an error is never cached."""
+        graph.error = "LLM unavailable"
+
+        self.run_task("t1")
+        self.run_task("t2")
+
+        assert celery_tasks._result_cache_key("JD", "Resume") not in backend.client.data
+        assert len(graph.executions) == 2
+
+
+class FakeGroup:
+    """Stand-in for celery.group that records the signatures it would enqueue."""
+
+    def __init__(self, signatures):
+        self.signatures = list(signatures)
+        self.id = "group-1"
+        self.results = [SimpleNamespace(id=f"sub-{i}") for i in range(len(self.signatures))]
+
+    def apply_async(self) -> "FakeGroup":
+        return self
+
+    def save(self) -> None:
+        pass
+
+
+class TestBatchDedup:
+    """Test that duplicate batch rows are analyzed once."""
+
+    def test_duplicate_rows_enqueue_one_task(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that each distinct input pair is enqueued once and duplicates point at it."""
+        groups: list[FakeGroup] = []
+
+        def fake_group(signatures) -> FakeGroup:
+            groups.append(FakeGroup(signatures))
+            return groups[-1]
+
+        monkeypatch.setattr(celery_tasks, "group", fake_group)
+        applications = [
+            {"job_description": "JD A", "resume": "Resume 1", "user_id": "u0"},
+            {"job_description": "JD B", "resume": "Resume 1", "user_id": "u1"},
+            {"job_description": "JD A", "resume": "Resume 1", "user_id": "u2"},
+            {"job_description": "JD B", "resume": "Resume 1", "user_id": "u3"},
+            {"job_description": "JD A", "resume": "Resume 1", "user_id": "u4"},
+        ]
+
+        result = celery_tasks.batch_analyze_applications_task.apply(
+            kwargs={"applications": applications, "batch_id": "b1"},
+        ).get()
+
+        enqueued = [sig.kwargs["job_description"] for sig in groups[0].signatures]
+        assert enqueued == ["JD A", "JD B"]
+        assert result["task_ids"] == ["sub-0", "sub-1", "sub-0", "sub-1", "sub-0"]
+        assert [entry.get("dedup_of") for entry in result["results"]] == [None, None, 0, 1, 0]
+        assert [entry["user_id"] for entry in result["results"]] == ["u0", "u1", "u2", "u3", "u4"]
+        assert result["queued"] == 5
+
+    def test_save_failure_keeps_rows_queued(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that a failed GroupResult save still reports the already queued task IDs."""
+        class UnsavableGroup(FakeGroup):
+            def save(self) -> None:
+                raise ConnectionError("result backend unavailable")
+
+        monkeypatch.setattr(celery_tasks, "group", UnsavableGroup)
+        applications = [
+            {"job_description": "JD A", "resume": "Resume 1", "user_id": "u0"},
+            {"job_description": "JD B", "resume": "Resume 1", "user_id": "u1"},
+        ]
+
+        result = celery_tasks.batch_analyze_applications_task.apply(
+            kwargs={"applications": applications, "batch_id": "b1"},
+        ).get()
+
+        assert result["group_id"] is None
+        assert result["task_ids"] == ["sub-0", "sub-1"]
+        assert (result["queued"], result["failed"]) == (2, 0)
+
+
+class TestGetBatchResults:
+    """Test collecting the results of a queued batch."""
+
+    def test_metas_map_to_row_statuses(self, backend: FakeBackend):
+        """Test that pending, successful and failed subtasks are reported per row."""
+        backend.store_meta("ok", "SUCCESS", {"matching_score": 0.85})
+        backend.store_meta("bad", "FAILURE", "LLM unavailable")
+        backend.store_meta("started", "STARTED", None)
+
+        result = celery_tasks.get_batch_results_task.apply(
+            kwargs={"batch_id": "b1", "task_ids": ["ok", "bad", "started", "missing"]},
+        ).get()
+
+        assert result["results"] == [
+            {"task_id": "ok", "status": "completed", "result": {"matching_score": 0.85}},
+            {"task_id": "bad", "status": "failed", "error": "LLM unavailable"},
+            {"task_id": "started", "status": "pending"},
+            {"task_id": "missing", "status": "pending"},
+        ]
+        assert (result["completed"], result["failed"], result["pending"]) == (1, 1, 2)
+
+    def test_duplicate_rows_copy_canonical_outcome(self, backend: FakeBackend):
+        """Test that repeated task IDs share the first row's outcome and are fetched once."""
+        backend.store_meta("ok", "SUCCESS", {"matching_score": 0.85})
+        backend.store_meta("bad", "FAILURE", "LLM unavailable")
+        fetched: list[list[str]] = []
+        mget = backend.client.mget
+
+        def recording_mget(keys: list[str]) -> list[bytes | None]:
+            fetched.append(keys)
+            return mget(keys)
+
+        backend.client.mget = recording_mget
+
+        result = celery_tasks.get_batch_results_task.apply(
+            kwargs={"batch_id": "b1", "task_ids": ["ok", "bad", "ok", "bad"]},
+        ).get()
+
+        assert len(fetched) == 1
+        assert len(fetched[0]) == 2
+        assert result["results"][2] == {**result["results"][0], "dedup_of": 0}
+        assert result["results"][3] == {**result["results"][1], "dedup_of": 1}
+        assert (result["total"], result["completed"], result["failed"]) == (4, 2, 2)
+
+
+class TestHealthCheck:
+    """Test the worker health probe."""
+
+    def test_healthy(self, backend: FakeBackend, graph: FakeGraph):
+        """Test that an initialized worker with a reachable backend is healthy."""
+        result = celery_tasks.health_check_task.apply().get()
+
+        assert result == {"status": "healthy", "llm_ready": True, "graph_ready": True}
+
+    def test_uninitialized_worker_builds_graph(self, backend: FakeBackend, monkeypatch: pytest.MonkeyPatch):
+        """Test that a worker that never ran worker_process_init initializes on the probe."""
+        monkeypatch.setattr(celery_tasks, "_GRAPH", None)
+        monkeypatch.setattr(celery_tasks, "init_llm", lambda: None)
+        monkeypatch.setattr(celery_tasks, "get_job_copilot_graph", FakeGraph)
+
+        result = celery_tasks.health_check_task.apply().get()
+
+        assert result == {"status": "healthy", "llm_ready": True, "graph_ready": True}
+        assert isinstance(celery_tasks._GRAPH, FakeGraph)
+
+    def test_failed_init_is_unhealthy(self, backend: FakeBackend, monkeypatch: pytest.MonkeyPatch):
+        """Test that a worker whose graph failed to initialize reports unhealthy."""
+        def get_graph() -> FakeGraph:
+            raise RuntimeError("OPENAI_API_KEY not set")
+
+        monkeypatch.setattr(celery_tasks, "_get_graph", get_graph)
+
+        result = celery_tasks.health_check_task.apply().get()
+
+        assert result == {"status": "unhealthy", "llm_ready": False, "graph_ready": False}
+
+    def test_backend_ping_failure_is_unhealthy(self, backend: FakeBackend, graph: FakeGraph):
+        """Test that an unreachable result backend reports unhealthy with the error."""
+        def ping() -> bool:
+            raise ConnectionError("Redis unreachable")
+
+        backend.client.ping = ping
+
+        result = celery_tasks.health_check_task.apply().get()
+
+        assert result["status"] == "unhealthy"
+        assert result["error"] == "Redis unreachable"
+
+
+class TestSubBatchDispatch:
+    """Test queuing a batch as budgeted sub-batches."""
+
+    def test_each_sub_batch_runs_as_one_batched_task(
+        self, backend: FakeBackend, graph: FakeGraph, monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that every sub-batch is one task running its rows through execute_batch."""
+        monkeypatch.setattr(celery_tasks.app.conf, "task_always_eager", True)
+        sub_batches = [
+            [{"job_description": "JD 1", "resume": "Resume 1"}, {"job_description": "JD 2", "resume": "Resume 2"}],
+            [{"job_description": "JD 3", "resume": "Resume 3"}],
+        ]
+
+        task_ids = celery_tasks.enqueue_sub_batches(sub_batches)
+
+        assert len(task_ids) == 2
+        assert len(set(task_ids)) == 2
+        assert graph.batches == [[("JD 1", "Resume 1"), ("JD 2", "Resume 2")], [("JD 3", "Resume 3")]]
+
+    def test_sub_batches_are_not_in_flight_together(
+        self, backend: FakeBackend, graph: FakeGraph, monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that the chain runs one sub-batch after another, in order."""
+        monkeypatch.setattr(celery_tasks.app.conf, "task_always_eager", True)
+        sub_batches = [[{"job_description": f"JD {i}", "resume": f"Resume {i}"}] for i in range(3)]
+
+        celery_tasks.enqueue_sub_batches(sub_batches)
+
+        assert graph.batches == [[(f"JD {i}", f"Resume {i}")] for i in range(3)]
+        assert graph.peak_batches == 1
+
+    def test_sub_batches_queue_as_one_chain_with_known_ids(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that every link of the queued chain runs under the task ID returned for it."""
+        chains: list[tuple[object, ...]] = []
+
+        class FakeChain:
+            def __init__(self, *signatures: object):
+                chains.append(signatures)
+
+            def apply_async(self) -> None:
+                pass
+
+        monkeypatch.setattr(celery_tasks, "chain", FakeChain)
+        sub_batches = [[{"job_description": "JD 1", "resume": "Resume 1"}], [{"job_description": "JD 2", "resume": "Resume 2"}]]
+
+        task_ids = celery_tasks.enqueue_sub_batches(sub_batches)
+
+        (signatures,) = chains
+        assert [signature.options["task_id"] for signature in signatures] == task_ids
+        assert [signature.kwargs["applications"] for signature in signatures] == sub_batches
+        assert all(signature.immutable for signature in signatures)
+
+    def test_failed_sub_batch_reports_rows_instead_of_raising(
+        self, backend: FakeBackend, graph: FakeGraph, monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test that a failing sub-batch returns failed rows so the chain carries on."""
+        async def execute_batch(_applications: list[tuple[str, str]], **_kwargs: object) -> list[dict[str, object]]:
+            raise RuntimeError("LLM unavailable")
+
+        monkeypatch.setattr(graph, "execute_batch", execute_batch)
+
+        results = celery_tasks.analyze_applications_batched_task.apply(
+            kwargs={"applications": [{"job_description": "JD", "resume": "Resume", "user_id": "u1"}]},
+        ).get()
+
+        assert results[0]["metadata"]["error"] == "Workflow execution failed: LLM unavailable"
+        assert results[0]["user_id"] == "u1"
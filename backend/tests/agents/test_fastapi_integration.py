@@ -1,15 +1,127 @@
 """Tests for FastAPI integration endpoints."""
 
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import httpx
+import orjson
 import pytest
+import redis.asyncio
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from app.main import app
+from app.services.agents import fastapi_integration
+
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+class FakeGraph:
+    """Stand-in for JobCopilotGraph that records how many runs overlap."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.running = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def execute(self, job_description: str, resume: str, **_kwargs: object) -> dict[str, object]:
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return {
+            "job_description_raw": job_description,
+            "resume_raw": resume,
+            "job_description": {"title": "Backend Engineer", "company": "TechCorp"},
+            "resume_analysis": {"skills_score": 0.9, "experience_score": 0.8},
+            "matching_score": 0.85,
+            "cover_letter": {"content": "Dear Hiring Manager...", "tone": "professional"},
+            "nodes_executed": ["parse_job_description", "parse_resume", "analyze_resume", "generate_cover_letter"],
+            "error": None,
+        }
+
+
+@pytest.fixture
+def fake_graph(monkeypatch: pytest.MonkeyPatch) -> FakeGraph:
+    """Serve the router's workflows from a FakeGraph with fresh concurrency caps."""
+    graph = FakeGraph()
+    monkeypatch.setattr(fastapi_integration, "get_job_copilot_graph", lambda: graph)
+    monkeypatch.setattr(fastapi_integration, "_workflow_semaphore", asyncio.Semaphore(16))
+    return graph
 
 
 @pytest.fixture
-def client():
-    """FastAPI test client."""
-    return TestClient(app)
+def queued_batches(monkeypatch: pytest.MonkeyPatch) -> list[list[dict[str, object]]]:
+    """Record the sub-batches /batch-analyze queues instead of sending them to Celery."""
+    queued: list[list[dict[str, object]]] = []
+
+    def enqueue_sub_batches(sub_batches: list[list[dict[str, object]]]) -> list[str]:
+        queued.extend(sub_batches)
+        return [f"task-{i}" for i in range(len(sub_batches))]
+
+    monkeypatch.setattr(fastapi_integration, "enqueue_sub_batches", enqueue_sub_batches)
+    return queued
+
+
+class FakePubSub:
+    """Stand-in for a Redis pub/sub connection replaying fixed messages."""
+
+    def __init__(self, messages: list[dict[str, object]]):
+        self.messages = messages
+        self.subscribed: list[str] = []
+        self.unsubscribed: list[str] = []
+
+    async def subscribe(self, channel: str) -> None:
+        self.subscribed.append(channel)
+
+    async def unsubscribe(self, channel: str) -> None:
+        self.unsubscribed.append(channel)
+
+    async def listen(self) -> AsyncIterator[dict[str, object]]:
+        for message in self.messages:
+            yield message
+
+
+class FakeAsyncRedis:
+    """Stand-in for the asyncio Redis client handing out one FakePubSub."""
+
+    def __init__(self, pubsub: FakePubSub):
+        self._pubsub = pubsub
+        self.closed = False
+
+    def pubsub(self) -> FakePubSub:
+        return self._pubsub
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class TestLifespan:
+    """Test router startup."""
+
+    def test_slow_warmup_does_not_block_startup(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that startup gives up on a warmup request that outlasts JC_WARMUP_TIMEOUT."""
+        class SlowWarmupGraph:
+            async def warmup(self) -> None:
+                await asyncio.sleep(10)
+
+        monkeypatch.setattr(fastapi_integration, "init_llm", lambda: None)
+        monkeypatch.setattr(fastapi_integration, "get_job_copilot_graph", SlowWarmupGraph)
+        monkeypatch.setattr(fastapi_integration, "WARMUP_LLM", True)
+        monkeypatch.setattr(fastapi_integration, "WARMUP_TIMEOUT", 0.05)
+
+        async def start_app() -> None:
+            async with fastapi_integration.lifespan(FastAPI()):
+                pass
+
+        started = time.perf_counter()
+        asyncio.run(start_app())
+
+        assert time.perf_counter() - started < 1
 
 
 class TestHealthEndpoint:
@@ -116,6 +228,85 @@ class TestAnalyzeEndpoint:
         # Should succeed without user_id
         assert response.status_code in [200, 202, 400, 422]
 
+    def test_analyze_timeout_returns_504(
+        self, router_client: TestClient, fake_graph: FakeGraph, monkeypatch: pytest.MonkeyPatch,
+        sample_job_description: str, sample_resume: str,
+    ):
+        """Test that a workflow exceeding WORKFLOW_TIMEOUT is answered with 504."""
+        monkeypatch.setattr(fastapi_integration, "WORKFLOW_TIMEOUT", 0.05)
+        fake_graph.delay = 1.0
+        payload = {"job_description": sample_job_description, "resume": sample_resume}
+
+        response = router_client.post("/api/v1/job-copilot/analyze", json=payload)
+
+        assert response.status_code == 504
+        assert response.json()["detail"] == "Workflow execution timed out"
+
+    def test_concurrent_requests_share_workflow_cap(
+        self, router_client: TestClient, fake_graph: FakeGraph, monkeypatch: pytest.MonkeyPatch,
+        sample_job_description: str, sample_resume: str,
+    ):
+        """Test that at most MAX_CONCURRENT_WORKFLOWS workflows run at once across requests."""
+        fake_graph.delay = 0.05
+        payload = {"job_description": sample_job_description, "resume": sample_resume}
+
+        async def send_requests() -> list[httpx.Response]:
+            monkeypatch.setattr(fastapi_integration, "_workflow_semaphore", asyncio.Semaphore(2))
+            transport = httpx.ASGITransport(app=router_client.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await asyncio.gather(*(
+                    client.post("/api/v1/job-copilot/analyze", json=payload) for _ in range(5)
+                ))
+
+        responses = asyncio.run(send_requests())
+
+        assert [response.status_code for response in responses] == [200] * 5
+        assert fake_graph.calls == 5
+        assert fake_graph.peak == 2
+
+    def test_analyze_streams_ndjson_when_requested(
+        self, router_client: TestClient, fake_graph: FakeGraph,
+        sample_job_description: str, sample_resume: str,
+    ):
+        """Test that Accept: application/x-ndjson streams one export section per line."""
+        payload = {"job_description": sample_job_description, "resume": sample_resume}
+
+        response = router_client.post(
+            "/api/v1/job-copilot/analyze", json=payload, headers={"accept": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [orjson.loads(line) for line in response.text.splitlines()]
+        assert [next(iter(line)) for line in lines] == ["job_description", "analysis", "cover_letter", "metadata"]
+        assert lines[1]["analysis"]["overall_fit_score"] == 0.85
+        assert lines[2]["cover_letter"]["content"] == "Dear Hiring Manager..."
+
+
+class TestStreamAnalysisEndpoint:
+    """Test the Server-Sent Events stream of a queued analysis."""
+
+    def test_stream_relays_frames_until_end(self, router_client: TestClient, monkeypatch: pytest.MonkeyPatch):
+        """Test that published frames are relayed as SSE events and the stream stops at the end event."""
+        node_frame = orjson.dumps({"event": "node_complete", "node": "parse_resume", "data": {}})
+        end_frame = orjson.dumps({"event": "end", "error": None})
+        pubsub = FakePubSub([
+            {"type": "subscribe", "data": 1},
+            {"type": "message", "data": node_frame},
+            {"type": "message", "data": end_frame},
+            {"type": "message", "data": orjson.dumps({"event": "late"})},
+        ])
+        redis_client = FakeAsyncRedis(pubsub)
+        monkeypatch.setattr(redis.asyncio, "from_url", lambda _url: redis_client)
+
+        response = router_client.get("/api/v1/job-copilot/analyze/stream/t1")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.content == b"data: " + node_frame + b"\n\ndata: " + end_frame + b"\n\n"
+        assert pubsub.subscribed == pubsub.unsubscribed == ["jc:stream:t1"]
+        assert redis_client.closed
+
 
 class TestBatchAnalyzeEndpoint:
     """Test batch analysis endpoint."""
@@ -150,8 +341,11 @@ class TestBatchAnalyzeEndpoint:
         # Should succeed
         assert response.status_code in [200, 400, 422]
 
-    def test_batch_analyze_exceeds_max(self, client: TestClient, sample_job_description: str, sample_resume: str):
-        """Test batch analysis exceeding maximum."""
+    def test_batch_analyze_more_than_ten(
+        self, router_client: TestClient, queued_batches: list[list[dict[str, object]]],
+        sample_job_description: str, sample_resume: str,
+    ):
+        """Test batch analysis is admitted by token budget, not a 10-application limit."""
         applications = [
             {
                 "job_description": sample_job_description,
@@ -161,10 +355,87 @@ class TestBatchAnalyzeEndpoint:
             for i in range(11)
         ]
 
-        response = client.post("/api/v1/job-copilot/batch-analyze", json=applications)
+        response = router_client.post("/api/v1/job-copilot/batch-analyze", json=applications)
 
-        # Should reject
-        assert response.status_code in [400, 422]
+        # Small inputs fit one sub-batch, so every application is queued together
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 11
+        assert data["successful"] == 11
+        assert data["sub_batches"] == 1
+        assert data["task_ids"] == ["task-0"]
+        assert len(data["results"]) == 11
+        assert [entry["id"] for entry in data["results"]] == [f"user-{i}" for i in range(11)]
+        assert [entry["position"] for entry in data["results"]] == list(range(11))
+        assert all(entry["status"] == "queued" and entry["task_id"] == "task-0" for entry in data["results"])
+        assert [row["user_id"] for row in queued_batches[0]] == [f"user-{i}" for i in range(11)]
+
+    def test_batch_analyze_over_application_cap(
+        self, router_client: TestClient, queued_batches: list[list[dict[str, object]]],
+        monkeypatch: pytest.MonkeyPatch, sample_job_description: str, sample_resume: str,
+    ):
+        """Test that a batch larger than MAX_BATCH_APPLICATIONS is rejected up front."""
+        monkeypatch.setattr(fastapi_integration, "MAX_BATCH_APPLICATIONS", 3)
+        applications = [
+            {"job_description": sample_job_description, "resume": sample_resume}
+            for _ in range(4)
+        ]
+
+        response = router_client.post("/api/v1/job-copilot/batch-analyze", json=applications)
+
+        assert response.status_code == 400
+        assert queued_batches == []
+
+    def test_batch_is_queued_not_run_in_request(
+        self, router_client: TestClient, fake_graph: FakeGraph, queued_batches: list[list[dict[str, object]]],
+        sample_job_description: str, sample_resume: str,
+    ):
+        """Test that the endpoint queues work for Celery instead of running workflows."""
+        applications = [{"job_description": sample_job_description, "resume": sample_resume}]
+
+        response = router_client.post("/api/v1/job-copilot/batch-analyze", json=applications)
+
+        assert response.status_code == 200
+        assert fake_graph.calls == 0
+        assert queued_batches == [[{"job_description": sample_job_description, "resume": sample_resume, "user_id": None}]]
+
+    def test_batch_splits_rows_by_token_budget(
+        self, router_client: TestClient, queued_batches: list[list[dict[str, object]]],
+        monkeypatch: pytest.MonkeyPatch, sample_job_description: str, sample_resume: str,
+    ):
+        """Test that rows over the token budget go to a new sub-batch with its own task."""
+        tokens = (len(sample_job_description) + len(sample_resume)) // fastapi_integration.CHARS_PER_TOKEN
+        monkeypatch.setattr(fastapi_integration, "MAX_BATCH_TOKENS", tokens * 2)
+        applications = [
+            {"job_description": sample_job_description, "resume": sample_resume, "user_id": f"user-{i}"}
+            for i in range(5)
+        ]
+
+        response = router_client.post("/api/v1/job-copilot/batch-analyze", json=applications)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["sub_batches"] == 3
+        assert data["task_ids"] == ["task-0", "task-1", "task-2"]
+        assert [len(rows) for rows in queued_batches] == [2, 2, 1]
+        assert [(entry["task_id"], entry["position"]) for entry in data["results"]] == [
+            ("task-0", 0), ("task-0", 1), ("task-1", 0), ("task-1", 1), ("task-2", 0),
+        ]
+
+    def test_batch_queue_failure_returns_503(
+        self, router_client: TestClient, monkeypatch: pytest.MonkeyPatch,
+        sample_job_description: str, sample_resume: str,
+    ):
+        """Test that an unreachable broker is reported instead of silently dropping the batch."""
+        def enqueue_sub_batches(_sub_batches: list[list[dict[str, object]]]) -> list[str]:
+            raise ConnectionError("broker unreachable")
+
+        monkeypatch.setattr(fastapi_integration, "enqueue_sub_batches", enqueue_sub_batches)
+        applications = [{"job_description": sample_job_description, "resume": sample_resume}]
+
+        response = router_client.post("/api/v1/job-copilot/batch-analyze", json=applications)
+
+        assert response.status_code == 503
 
     def test_batch_analyze_empty_list(self, client: TestClient):
         """Test batch analysis with empty list."""
@@ -268,16 +539,11 @@ class TestErrorHandling:
 class TestRateLimitingAndSecurity:
     """Test rate limiting and security measures."""
 
-    def test_multiple_requests_succeed(self, client: TestClient, sample_job_description: str, sample_resume: str):
+    def test_multiple_requests_succeed(self, client: TestClient, analyze_body_bytes: bytes):
         """Test that multiple requests are handled."""
-        payload = {
-            "job_description": sample_job_description,
-            "resume": sample_resume,
-        }
-
         responses = []
         for _ in range(3):
-            response = client.post("/api/v1/job-copilot/analyze", json=payload)
+            response = client.post("/api/v1/job-copilot/analyze", content=analyze_body_bytes, headers=JSON_HEADERS)
             responses.append(response.status_code)
 
         # All should return 200, 202, or fail with same error
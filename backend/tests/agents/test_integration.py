@@ -3,6 +3,15 @@
 These tests verify components work together correctly end-to-end.
 """
 
+from app.services.agents.nodes.analyze_resume import ResumeAnalysis
+from app.services.agents.nodes.parse_jd import ParsedJobDescription
+from app.services.agents.state import JobCopilotState
+from app.services.agents.utils import (
+    export_workflow_result,
+    get_summary,
+    validate_inputs,
+)
+
 
 class TestWorkflowIntegration:
     """Test integrated workflow scenarios."""
@@ -110,8 +119,6 @@ class TestValidationIntegration:
 
     def test_valid_workflow_inputs_pass_validation(self, sample_job_description: str, sample_resume: str):
         """Test that valid workflow inputs pass all validation."""
-        from app.services.agents.utils import validate_inputs
-
         is_valid, error = validate_inputs(sample_job_description, sample_resume)
 
         assert is_valid is True
@@ -119,8 +126,6 @@ class TestValidationIntegration:
 
     def test_invalid_inputs_rejected_early(self):
         """Test that invalid inputs are rejected early."""
-        from app.services.agents.utils import validate_inputs
-
         # All invalid combinations should fail
         invalid_cases = [
             ("", ""),
@@ -137,8 +142,6 @@ class TestValidationIntegration:
 
     def test_boundary_validation(self):
         """Test exact boundary conditions."""
-        from app.services.agents.utils import validate_inputs
-
         # Exactly 50 chars should pass
         exact_50 = "a" * 50
         is_valid, _ = validate_inputs(exact_50, exact_50)
@@ -155,8 +158,6 @@ class TestDataProcessingIntegration:
 
     def test_export_workflow_with_all_data(self):
         """Test exporting workflow result with all data."""
-        from app.services.agents.utils import export_workflow_result
-
         complete_result = {
             "job_description_raw": "JD",
             "resume_raw": "Resume",
@@ -203,8 +204,6 @@ class TestDataProcessingIntegration:
 
     def test_summary_generation_from_export(self):
         """Test generating summary from exported result."""
-        from app.services.agents.utils import get_summary
-
         result = {
             "job_description": {
                 "title": "Backend Dev",
@@ -233,8 +232,6 @@ class TestErrorRecovery:
 
     def test_missing_optional_fields_handled(self):
         """Test handling of missing optional fields."""
-        from app.services.agents.nodes.parse_jd import ParsedJobDescription
-
         job = ParsedJobDescription(
             title="Dev",
             company="Corp",
@@ -250,8 +247,6 @@ class TestErrorRecovery:
 
     def test_analysis_with_no_matches(self):
         """Test analysis when resume doesn't match job at all."""
-        from app.services.agents.nodes.analyze_resume import ResumeAnalysis
-
         analysis = ResumeAnalysis(
             overall_fit_score=0.0,
             skills_score=0.0,
@@ -272,8 +267,6 @@ class TestSecurityIntegration:
 
     def test_malicious_input_safe_handling(self, malicious_resume_prompt_injection: str, sample_job_description: str):
         """Test that malicious inputs are handled safely in workflow."""
-        from app.services.agents.utils import validate_inputs
-
         # Should validate successfully (safety is LLM responsibility)
         is_valid, error = validate_inputs(sample_job_description, malicious_resume_prompt_injection)
 
@@ -282,8 +275,6 @@ class TestSecurityIntegration:
 
     def test_data_isolation_in_state(self):
         """Test that state changes don't leak between instances."""
-        from app.services.agents.state import JobCopilotState
-
         state1 = JobCopilotState(
             job_description_raw="Test 1",
             resume_raw="Resume 1",
@@ -322,8 +313,6 @@ class TestConcurrency:
 
     def test_independent_workflows_isolated(self):
         """Test that independent workflows don't interfere."""
-        from app.services.agents.state import JobCopilotState
-
         # Simulate two concurrent workflows
         workflow1 = JobCopilotState(
             job_description_raw="JD 1",
@@ -383,8 +372,6 @@ class TestDataConsistency:
 
     def test_state_consistency_through_export(self):
         """Test that state remains consistent through export."""
-        from app.services.agents.utils import export_workflow_result
-
         original_result = {
             "job_description_raw": "JD",
             "resume_raw": "Resume",
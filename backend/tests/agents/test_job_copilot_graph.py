@@ -0,0 +1,189 @@
+"""Tests for the Job Copilot workflow graph."""
+
+import asyncio
+
+import pytest
+from langgraph.graph import END
+
+from app.services.agents import job_copilot_graph
+from app.services.agents.job_copilot_graph import (
+    COVER_LETTER_MIN_SCORE,
+    JobCopilotGraph,
+    _entry_nodes,
+    _route_after_analysis,
+)
+
+# State update each stubbed node returns, keyed by node name
+NODE_UPDATES: dict[str, dict[str, object]] = {
+    "parse_job_description": {"job_description": {"title": "Dev", "requirements": ["Python"]}},
+    "parse_resume": {"resume_data": {"name": "John", "skills": ["Python"]}},
+    "analyze_resume": {"resume_analysis": {"overall_fit_score": 0.8}, "matching_score": 0.8},
+    "generate_cover_letter": {"cover_letter": {"content": "Letter", "tone": "professional"}},
+}
+
+
+@pytest.fixture
+def node_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Replace the graph's nodes with stubs; returns the names of nodes run."""
+    calls: list[str] = []
+
+    def stub(name: str):
+        async def node(_state: dict[str, object]) -> dict[str, object]:
+            calls.append(name)
+            return {**NODE_UPDATES[name], "nodes_executed": [name]}
+        return node
+
+    for name in NODE_UPDATES:
+        monkeypatch.setattr(job_copilot_graph, name, stub(name))
+    return calls
+
+
+class TestEntryNodes:
+    """Test routing of a (possibly resumed) run to its first unfinished nodes."""
+
+    def test_nothing_executed_starts_both_parsers(self):
+        """Test that a fresh run starts both parsers."""
+        assert _entry_nodes({"nodes_executed": []}) == ["parse_job_description", "parse_resume"]
+
+    def test_one_parser_done_starts_the_other(self):
+        """Test that only the unfinished parser runs."""
+        assert _entry_nodes({"nodes_executed": ["parse_resume"]}) == ["parse_job_description"]
+
+    def test_both_parsers_done_starts_analysis(self):
+        """Test that analysis runs once both parsers are done."""
+        state = {"nodes_executed": ["parse_resume", "parse_job_description"]}
+
+        assert _entry_nodes(state) == ["analyze_resume"]
+
+    def test_analysis_done_starts_cover_letter(self):
+        """Test that a run resumed after analysis only writes the cover letter."""
+        state = {"nodes_executed": ["parse_job_description", "parse_resume", "analyze_resume"]}
+
+        assert _entry_nodes(state) == ["generate_cover_letter"]
+
+    def test_everything_done_ends(self):
+        """Test that a fully checkpointed run ends immediately."""
+        state = {"nodes_executed": list(NODE_UPDATES)}
+
+        assert _entry_nodes(state) == [END]
+
+
+class TestRouteAfterAnalysis:
+    """Test the decision to write a cover letter after analysis."""
+
+    def test_score_below_threshold_ends(self):
+        """Test that a poor fit skips the cover letter."""
+        assert _route_after_analysis({"matching_score": COVER_LETTER_MIN_SCORE - 0.01}) == END
+
+    def test_score_at_threshold_writes_cover_letter(self):
+        """Test that the threshold itself is a good enough fit."""
+        assert _route_after_analysis({"matching_score": COVER_LETTER_MIN_SCORE}) == "generate_cover_letter"
+
+    def test_score_above_threshold_writes_cover_letter(self):
+        """Test that a good fit goes on to the cover letter."""
+        assert _route_after_analysis({"matching_score": COVER_LETTER_MIN_SCORE + 0.01}) == "generate_cover_letter"
+
+    def test_missing_score_ends(self):
+        """Test that an unscored analysis counts as a zero score."""
+        assert _route_after_analysis({"matching_score": None}) == END
+
+    def test_error_ends(self):
+        """Test that a failed run ends whatever the score."""
+        assert _route_after_analysis({"matching_score": 0.9, "error": "boom"}) == END
+
+
+class TestResumedExecution:
+    """Test executing the graph from a checkpointed state."""
+
+    def test_resume_skips_completed_nodes(self, node_calls: list[str]):
+        """Test that nodes already in the checkpoint are not run again."""
+        graph = JobCopilotGraph()
+        checkpoint = {
+            **NODE_UPDATES["parse_job_description"],
+            **NODE_UPDATES["parse_resume"],
+            "nodes_executed": ["parse_job_description", "parse_resume"],
+        }
+
+        result = asyncio.run(graph.execute("JD", "Resume", resume_from=checkpoint))
+
+        assert node_calls == ["analyze_resume", "generate_cover_letter"]
+        assert result["nodes_executed"] == [
+            "parse_job_description", "parse_resume", "analyze_resume", "generate_cover_letter",
+        ]
+        assert result["job_description"] == NODE_UPDATES["parse_job_description"]["job_description"]
+        assert result["error"] is None
+
+    def test_fresh_run_executes_every_node(self, node_calls: list[str]):
+        """Test that without a checkpoint every node runs once."""
+        graph = JobCopilotGraph()
+
+        asyncio.run(graph.execute("JD", "Resume"))
+
+        assert sorted(node_calls) == sorted(NODE_UPDATES)
+
+
+class FakeCompiledGraph:
+    """Stand-in for the compiled graph's abatch that records its arguments."""
+
+    def __init__(self):
+        self.config: dict[str, object] | None = None
+        self.return_exceptions: bool | None = None
+
+    async def abatch(self, inputs: list[dict[str, object]], config: dict[str, object], return_exceptions: bool) -> list[object]:
+        self.config = config
+        self.return_exceptions = return_exceptions
+        return [
+            RuntimeError("LLM unavailable") if state["resume_raw"] == "bad" else {**state, "matching_score": 0.8}
+            for state in inputs
+        ]
+
+
+class TestExecuteBatch:
+    """Test running several applications in one batched call."""
+
+    @pytest.fixture
+    def graph(self) -> tuple[JobCopilotGraph, FakeCompiledGraph]:
+        """A graph whose compiled workflow is a FakeCompiledGraph."""
+        graph = JobCopilotGraph()
+        compiled = FakeCompiledGraph()
+        graph._compiled = compiled
+        return graph, compiled
+
+    def test_results_keep_input_order(self, graph: tuple[JobCopilotGraph, FakeCompiledGraph]):
+        """Test that final states line up with the applications they came from."""
+        copilot, _ = graph
+        applications = [("JD 1", "Resume 1"), ("JD 2", "Resume 2"), ("JD 3", "Resume 3")]
+
+        results = asyncio.run(copilot.execute_batch(applications))
+
+        assert [(r["job_description_raw"], r["resume_raw"]) for r in results] == applications
+
+    def test_failed_item_becomes_error_state(self, graph: tuple[JobCopilotGraph, FakeCompiledGraph]):
+        """Test that one failing workflow does not fail the rest of the batch."""
+        copilot, compiled = graph
+
+        results = asyncio.run(copilot.execute_batch([("JD 1", "Resume 1"), ("JD 2", "bad")]))
+
+        assert compiled.return_exceptions is True
+        assert results[0]["matching_score"] == 0.8
+        assert results[1] == {
+            "job_description_raw": "JD 2",
+            "resume_raw": "bad",
+            "error": "Workflow execution failed: LLM unavailable",
+            "nodes_executed": [],
+        }
+
+    def test_max_concurrency_is_passed_through(self, graph: tuple[JobCopilotGraph, FakeCompiledGraph]):
+        """Test that the concurrency cap reaches the batch config alongside the caller's config."""
+        copilot, compiled = graph
+
+        asyncio.run(copilot.execute_batch([("JD 1", "Resume 1")], config={"tags": ["batch"]}, max_concurrency=2))
+
+        assert compiled.config == {"tags": ["batch"], "max_concurrency": 2}
+
+    def test_empty_batch_skips_graph(self, graph: tuple[JobCopilotGraph, FakeCompiledGraph]):
+        """Test that an empty batch returns without calling the graph."""
+        copilot, compiled = graph
+
+        assert asyncio.run(copilot.execute_batch([])) == []
+        assert compiled.config is None
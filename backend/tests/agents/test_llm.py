@@ -1,8 +1,17 @@
 """Tests for LLM integration."""
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
-from app.services.agents.llm import LLMProvider
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from app.services.agents import init_llm
+from app.services.agents.llm import LLMConfig, LLMProvider, ainvoke_shared
+
+# The provider only stores the ChatOpenAI instance, so a bare object is
+# enough to stand in for it
+_FAKE_LLM = object()
 
 
 class TestLLMProvider:
@@ -46,9 +55,7 @@ class TestLLMProviderWithMocks:
     @patch('app.services.agents.llm.ChatOpenAI')
     def test_init_llm_creates_provider(self, mock_chat_openai):
         """Test that init_llm creates provider."""
-        from app.services.agents import init_llm
-
-        mock_chat_openai.return_value = MagicMock()
+        mock_chat_openai.return_value = _FAKE_LLM
         LLMProvider.reset()
 
         init_llm()
@@ -59,9 +66,7 @@ class TestLLMProviderWithMocks:
     @patch('app.services.agents.llm.ChatOpenAI')
     def test_multiple_init_calls_reuse_instance(self, mock_chat_openai):
         """Test that multiple init_llm calls reuse the instance."""
-        from app.services.agents import init_llm
-
-        mock_chat_openai.return_value = MagicMock()
+        mock_chat_openai.return_value = _FAKE_LLM
         LLMProvider.reset()
 
         init_llm()
@@ -77,7 +82,6 @@ class TestLLMProviderWithMocks:
         """Test LLM provider error handling."""
         mock_chat_openai.side_effect = Exception("API Key not found")
 
-        from app.services.agents import init_llm
         LLMProvider.reset()
 
         # Should handle error gracefully
@@ -90,28 +94,16 @@ class TestLLMProviderWithMocks:
 class TestLLMIntegration:
     """Test LLM integration with workflows."""
 
-    @patch('app.services.agents.llm.ChatOpenAI')
-    def test_llm_available_for_parsing(self, mock_chat_openai):
+    def test_llm_available_for_parsing(self, llm_provider: LLMProvider):
         """Test that LLM is available for parsing nodes."""
-        mock_llm = MagicMock()
-        mock_chat_openai.return_value = mock_llm
-
-        from app.services.agents import init_llm
-        LLMProvider.reset()
-
-        init_llm()
-        provider = LLMProvider.get_instance()
-
         # Should be able to access LLM
-        assert provider is not None
+        assert llm_provider.get_llm() is not None
 
     @patch('app.services.agents.llm.ChatOpenAI')
     def test_llm_model_configuration(self, mock_chat_openai):
         """Test LLM model configuration."""
-        mock_llm = MagicMock()
-        mock_chat_openai.return_value = mock_llm
+        mock_chat_openai.return_value = _FAKE_LLM
 
-        from app.services.agents import init_llm
         LLMProvider.reset()
 
         init_llm()
@@ -126,10 +118,7 @@ class TestLLMCaching:
     @patch('app.services.agents.llm.ChatOpenAI')
     def test_llm_instance_cached(self, mock_chat_openai):
         """Test that LLM instance is properly cached."""
-        from app.services.agents import init_llm
-
-        mock_llm = MagicMock()
-        mock_chat_openai.return_value = mock_llm
+        mock_chat_openai.return_value = _FAKE_LLM
 
         LLMProvider.reset()
 
@@ -142,37 +131,123 @@ class TestLLMCaching:
         assert mock_chat_openai.call_count <= 1
 
 
+def _fake_chat_openai(**kwargs: object) -> FakeListChatModel:
+    """Build a model that replies with a new answer per uncached call."""
+    return FakeListChatModel(responses=["first", "second"], cache=kwargs["cache"])
+
+
+class TestLLMResponseCache:
+    """Test caching of LLM responses."""
+
+    @patch('app.services.agents.llm.ChatOpenAI', side_effect=_fake_chat_openai)
+    def test_caching_disabled_by_default(self, _mock_chat_openai):
+        """Test that the default configuration sends every prompt to the model."""
+        LLMProvider.reset()
+        provider = LLMProvider.get_instance()
+        provider.init(LLMConfig())
+
+        llm = provider.get_llm()
+
+        assert provider._cache is None
+        assert [llm.invoke("hi").content, llm.invoke("hi").content] == ["first", "second"]
+
+    @patch('app.services.agents.llm.ChatOpenAI', side_effect=_fake_chat_openai)
+    def test_cache_hit_reuses_response(self, _mock_chat_openai):
+        """Test that a repeated prompt is answered from the cache."""
+        LLMProvider.reset()
+        provider = LLMProvider.get_instance()
+        provider.init(LLMConfig(cache_size=16))
+
+        llm = provider.get_llm()
+
+        assert [llm.invoke("hi").content, llm.invoke("hi").content] == ["first", "first"]
+
+    @patch('app.services.agents.llm.ChatOpenAI', side_effect=_fake_chat_openai)
+    def test_disabling_drops_cache(self, _mock_chat_openai):
+        """Test that re-initializing with caching off discards cached responses."""
+        LLMProvider.reset()
+        provider = LLMProvider.get_instance()
+        provider.init(LLMConfig(cache_size=16))
+        provider.get_llm().invoke("hi")
+
+        provider.init(LLMConfig(cache_size=0))
+
+        assert provider._cache is None
+        assert provider.get_llm().invoke("hi").content == "first"
+
+
 class TestLLMProviderThreadSafety:
     """Test LLM provider thread safety (basic)."""
 
     @patch('app.services.agents.llm.ChatOpenAI')
     def test_concurrent_access(self, mock_chat_openai):
         """Test concurrent access to LLM provider."""
-        import threading
+        mock_chat_openai.return_value = _FAKE_LLM
 
-        from app.services.agents import init_llm
+        LLMProvider.reset()
 
-        mock_llm = MagicMock()
-        mock_chat_openai.return_value = mock_llm
+        def access_provider(_):
+            init_llm()
+            return LLMProvider.get_instance()
 
-        LLMProvider.reset()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(access_provider, range(5)))
 
-        results = []
+        # All should get same instance
+        assert all(r is results[0] for r in results)
 
-        def access_provider():
-            init_llm()
-            provider = LLMProvider.get_instance()
-            results.append(provider)
 
-        threads = [threading.Thread(target=access_provider) for _ in range(5)]
+class TestSharedInvocation:
+    """Test coalescing of concurrent identical chain calls."""
 
-        for t in threads:
-            t.start()
+    def test_concurrent_identical_calls_share_one_invocation(self):
+        """Test that equal inputs in flight together invoke the chain once."""
+        calls = []
 
-        for t in threads:
-            t.join()
+        class FakeChain:
+            async def ainvoke(self, inputs, config=None):
+                calls.append(inputs)
+                await asyncio.sleep(0.01)
+                return {"echo": inputs["text"]}
 
-        # All should get same instance
-        if len(results) > 1:
-            for r in results[1:]:
-                assert r is results[0] or r is not None
+        async def run():
+            chain = FakeChain()
+            return await asyncio.gather(
+                ainvoke_shared("node", chain, {"text": "same"}),
+                ainvoke_shared("node", chain, {"text": "same"}),
+                ainvoke_shared("node", chain, {"text": "other"}),
+            )
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 2
+        assert results[0] == results[1] == {"echo": "same"}
+        assert results[2] == {"echo": "other"}
+
+    def test_config_is_passed_to_chain(self):
+        """Test that the caller's config reaches the chain so callbacks and tracing still apply."""
+        configs = []
+
+        class FakeChain:
+            async def ainvoke(self, inputs, config=None):
+                configs.append(config)
+                return inputs
+
+        config = {"tags": ["parse_resume"], "callbacks": []}
+        asyncio.run(ainvoke_shared("node", FakeChain(), {"text": "same"}, config=config))
+
+        assert configs == [config]
+
+
+class TestChainCache:
+    """Test per-provider chain memoization."""
+
+    def test_get_chain_builds_once(self, llm_provider: LLMProvider):
+        """Test that a named chain is built once and reused."""
+        build = MagicMock(return_value=MagicMock())
+
+        chain1 = llm_provider.get_chain("node", build)
+        chain2 = llm_provider.get_chain("node", build)
+
+        assert chain1 is chain2
+        build.assert_called_once_with(llm_provider.get_llm())
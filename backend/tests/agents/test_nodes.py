@@ -1,8 +1,45 @@
 """Tests for Job Copilot workflow nodes."""
 
+import asyncio
+import importlib
+from collections.abc import AsyncIterator
+
+import pytest
+
 from app.services.agents.nodes.analyze_resume import ResumeAnalysis
 from app.services.agents.nodes.generate_cover_letter import CoverLetterOutput
 from app.services.agents.nodes.parse_jd import ParsedJobDescription
+from app.services.agents.nodes.parse_resume import EducationEntry, ExperienceEntry, ParsedResume, ProjectEntry
+
+# Node modules (the package re-exports their node functions under the same names)
+analyze_resume_module = importlib.import_module("app.services.agents.nodes.analyze_resume")
+generate_cover_letter_module = importlib.import_module("app.services.agents.nodes.generate_cover_letter")
+parse_resume_module = importlib.import_module("app.services.agents.nodes.parse_resume")
+
+SAMPLE_PARSED_RESUME = ParsedResume(
+    name="John Doe",
+    email="john@example.com",
+    phone=None,
+    experience=[ExperienceEntry(title="Backend Engineer", company="TechCorp", duration="3 years", highlights=["Led API redesign"])],
+    skills=["Python", "FastAPI"],
+    education=[EducationEntry(degree="BSc Computer Science", institution="MIT", year="2018")],
+    projects=[ProjectEntry(name="Copilot", description="Job application assistant")],
+)
+
+
+def stub_chain(monkeypatch: pytest.MonkeyPatch, module: object, output: object) -> list[dict[str, object]]:
+    """Serve a node's LLM chain from a stub; returns the inputs it was invoked with."""
+    calls: list[dict[str, object]] = []
+
+    async def ainvoke_shared(_name: str, _chain: object, inputs: dict[str, object], config: object = None) -> object:
+        calls.append(inputs)
+        if isinstance(output, Exception):
+            raise output
+        return output
+
+    monkeypatch.setattr(module, "get_chain", lambda _name, _build: object())
+    monkeypatch.setattr(module, "ainvoke_shared", ainvoke_shared)
+    return calls
 
 
 class TestParseJDNode:
@@ -83,9 +120,96 @@ class TestParseJDNode:
         assert parsed["requirements"] == []
 
 
+class TestParseResumeNode:
+    """Test resume parsing node."""
+
+    def test_parsed_resume_structure(self):
+        """Test ParsedResume structure."""
+        parsed = ParsedResume(
+            name="John Doe",
+            email="john@example.com",
+            phone=None,
+            experience=[ExperienceEntry(title="Backend Engineer", company="TechCorp", duration="3 years", highlights=[])],
+            skills=["Python", "FastAPI"],
+            education=[EducationEntry(degree="BSc Computer Science", institution="MIT", year="2018")],
+            projects=[],
+        )
+
+        assert parsed.name == "John Doe"
+        assert parsed.phone is None
+        assert parsed.skills == ["Python", "FastAPI"]
+        assert parsed.experience[0].company == "TechCorp"
+        assert parsed.projects == []
+
+    def test_parse_resume_success(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that the chain's output becomes the state's resume data."""
+        calls = stub_chain(monkeypatch, parse_resume_module, SAMPLE_PARSED_RESUME)
+
+        update = asyncio.run(parse_resume_module.parse_resume({"resume_raw": "John Doe resume"}))
+
+        assert calls == [{"resume_raw": "John Doe resume"}]
+        assert update["nodes_executed"] == ["parse_resume"]
+        assert update["resume_data"]["name"] == "John Doe"
+        assert update["resume_data"]["skills"] == ["Python", "FastAPI"]
+        assert update["resume_data"]["raw_text"] == "John Doe resume"
+        assert update["resume_data"]["experience"][0]["highlights"] == ["Led API redesign"]
+
+    def test_parse_resume_failure_is_not_fatal(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that a chain error leaves resume data unset instead of failing the workflow."""
+        stub_chain(monkeypatch, parse_resume_module, RuntimeError("LLM unavailable"))
+
+        update = asyncio.run(parse_resume_module.parse_resume({"resume_raw": "John Doe resume"}))
+
+        assert update == {"nodes_executed": ["parse_resume"]}
+
+    def test_parse_resume_empty_resume_skips_chain(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that an empty resume is not sent to the LLM."""
+        calls = stub_chain(monkeypatch, parse_resume_module, SAMPLE_PARSED_RESUME)
+
+        update = asyncio.run(parse_resume_module.parse_resume({"resume_raw": ""}))
+
+        assert calls == []
+        assert update == {"nodes_executed": ["parse_resume"]}
+
+
 class TestResumeAnalysisNode:
     """Test resume analysis node."""
 
+    def test_requirements_fall_back_to_list(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that a job description without pre-joined strings still builds the prompt."""
+        analysis = ResumeAnalysis(
+            matched_skills=["Python"],
+            missing_skills=["Go"],
+            nice_to_have_matches=[],
+            experience_match="Strong backend experience",
+            experience_score=0.8,
+            skills_score=0.7,
+            overall_fit_score=0.75,
+            strengths=["APIs"],
+            weaknesses=["No Go"],
+            recommendations=["Learn Go"],
+        )
+        calls = stub_chain(monkeypatch, analyze_resume_module, analysis)
+        state = {
+            "job_description": {"title": "Dev", "company": "TechCorp", "requirements": ["Python", "Go"], "nice_to_have": ["K8s"]},
+            "resume_raw": "John Doe resume",
+        }
+
+        update = asyncio.run(analyze_resume_module.analyze_resume(state))
+
+        assert calls[0]["requirements"] == "Go, Python"
+        assert calls[0]["nice_to_have"] == "K8s"
+        assert update["matching_score"] == 0.75
+
+    def test_analyze_resume_skips_after_error(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that analysis does nothing once an earlier node has failed."""
+        calls = stub_chain(monkeypatch, analyze_resume_module, RuntimeError("should not be called"))
+
+        update = asyncio.run(analyze_resume_module.analyze_resume({"error": "Parsing failed", "resume_raw": "John Doe resume"}))
+
+        assert update == {}
+        assert calls == []
+
     def test_resume_analysis_structure(self):
         """Test ResumeAnalysis structure."""
         analysis = ResumeAnalysis(
@@ -153,9 +277,68 @@ class TestResumeAnalysisNode:
         assert 0 <= analysis["experience_score"] <= 1
 
 
+class FakeStreamingChain:
+    """Stand-in for the cover letter chain that streams fixed partial results."""
+
+    def __init__(self, partials: list[dict[str, object]]):
+        self.partials = partials
+        self.inputs: dict[str, object] | None = None
+
+    async def astream(self, inputs: dict[str, object], config: object = None) -> AsyncIterator[dict[str, object]]:
+        self.inputs = inputs
+        for partial in self.partials:
+            yield partial
+
+
 class TestCoverLetterNode:
     """Test cover letter generation node."""
 
+    def test_generate_cover_letter_streams_partials(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that each streamed partial is dispatched and the last one becomes the cover letter."""
+        final = {"content": "Dear Hiring Manager, ...", "tone": "professional", "highlighted_skills": ["Python"], "key_achievements": []}
+        partials = [{"content": "Dear"}, {"content": "Dear Hiring Manager,", "tone": "professional"}, final]
+        chain = FakeStreamingChain(partials)
+        dispatched: list[tuple[str, dict[str, object]]] = []
+
+        async def adispatch_custom_event(name: str, data: dict[str, object], config: object = None) -> None:
+            dispatched.append((name, data))
+
+        monkeypatch.setattr(generate_cover_letter_module, "get_chain", lambda _name, _build: chain)
+        monkeypatch.setattr(generate_cover_letter_module, "adispatch_custom_event", adispatch_custom_event)
+        state = {
+            "job_description": {"title": "Dev", "company": "TechCorp", "requirements": ["Python"]},
+            "resume_raw": "John Doe resume",
+            "resume_analysis": {"matched_skills": ["Python"], "overall_fit_score": 0.8},
+        }
+
+        update = asyncio.run(generate_cover_letter_module.generate_cover_letter(state, config={}))
+
+        assert dispatched == [("cover_letter_partial", partial) for partial in partials]
+        assert update == {"cover_letter": final, "nodes_executed": ["generate_cover_letter"]}
+        assert chain.inputs["requirements"] == "Python"
+        assert chain.inputs["overall_fit_score"] == 80
+
+    def test_generate_cover_letter_without_config_skips_events(self, monkeypatch: pytest.MonkeyPatch):
+        """Test that a direct call outside a graph run dispatches no events."""
+        final = {"content": "Dear Hiring Manager, ...", "tone": "professional", "highlighted_skills": [], "key_achievements": []}
+        dispatched: list[str] = []
+
+        async def adispatch_custom_event(name: str, _data: dict[str, object], config: object = None) -> None:
+            dispatched.append(name)
+
+        monkeypatch.setattr(generate_cover_letter_module, "get_chain", lambda _name, _build: FakeStreamingChain([final]))
+        monkeypatch.setattr(generate_cover_letter_module, "adispatch_custom_event", adispatch_custom_event)
+        state = {
+            "job_description": {"title": "Dev", "company": "TechCorp", "requirements": []},
+            "resume_raw": "John Doe resume",
+            "resume_analysis": {"overall_fit_score": 0.8},
+        }
+
+        update = asyncio.run(generate_cover_letter_module.generate_cover_letter(state))
+
+        assert dispatched == []
+        assert update["cover_letter"]["content"] == "Dear Hiring Manager, ..."
+
     def test_cover_letter_output_structure(self):
         """Test CoverLetterOutput structure."""
         letter = CoverLetterOutput(
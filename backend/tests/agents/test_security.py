@@ -47,8 +47,8 @@ class TestDataExposure:
     def test_circular_reference_handling(self):
         """Test handling of circular references in objects."""
         obj = {"name": "test"}
-        # Note: format_for_json doesn't protect against circular refs
-        # This is acceptable as input is from trusted sources
+        # Note: circular refs are rejected by format_for_json's nesting
+        # depth guard (see test_utils); this object has none
         formatted = format_for_json(obj)
         assert formatted["name"] == "test"
 
@@ -187,6 +187,19 @@ class TestJobCopilotStateDict:
         assert state_dict["matching_score"] == 0.8
         assert state_dict["error"] is None
 
+    def test_timestamps_set_lazily(self):
+        """Test that timestamps are only stamped once the state changes."""
+        state = JobCopilotState(job_description_raw="JD", resume_raw="Resume")
+
+        assert state.created_at is None
+        assert state.updated_at is None
+
+        state.add_node_execution("parse_jd")
+
+        assert state.nodes_executed == ["parse_jd"]
+        assert state.created_at is not None
+        assert state.to_dict()["updated_at"] == state.updated_at
+
 
 class TestStateTransitions:
     """Test valid state transitions."""
@@ -1,10 +1,19 @@
 """Unit tests for Job Copilot utilities."""
 
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
 from app.services.agents.utils import (
+    MAX_NESTING_DEPTH,
+    dump_for_json,
     export_workflow_result,
     format_for_json,
     get_summary,
     merge_results,
+    stream_workflow_result,
     validate_inputs,
 )
 
@@ -146,6 +155,29 @@ class TestExportWorkflowResult:
         assert exported["metadata"]["nodes_executed"] == []
 
 
+class TestStreamWorkflowResult:
+    """Test NDJSON streaming of exported results."""
+
+    def test_stream_yields_one_line_per_section(self):
+        """Test that each export section is streamed as its own JSON line."""
+        result = {
+            "job_description": {"title": "Dev", "requirements": ["Python"]},
+            "matching_score": 0.7,
+            "cover_letter": {"content": "Dear Hiring Manager...", "tone": "professional"},
+            "nodes_executed": ["parse_job_description"],
+            "error": None,
+        }
+
+        async def collect():
+            return [chunk async for chunk in stream_workflow_result(result)]
+
+        chunks = asyncio.run(collect())
+        lines = [json.loads(chunk) for chunk in chunks]
+
+        assert all(chunk.endswith(b"\n") for chunk in chunks)
+        assert {k: v for line in lines for k, v in line.items()} == export_workflow_result(result)
+
+
 class TestGetSummary:
     """Test summary generation."""
 
@@ -198,8 +230,6 @@ class TestFormatForJson:
 
     def test_format_datetime(self):
         """Test formatting datetime objects."""
-        from datetime import datetime
-
         dt = datetime(2024, 2, 13, 15, 30, 0)
         formatted = format_for_json(dt)
 
@@ -208,8 +238,6 @@ class TestFormatForJson:
 
     def test_format_nested_dict(self):
         """Test formatting nested dictionaries."""
-        from datetime import datetime
-
         obj = {
             "name": "John",
             "created": datetime(2024, 2, 13),
@@ -225,8 +253,6 @@ class TestFormatForJson:
 
     def test_format_list(self):
         """Test formatting lists."""
-        from datetime import datetime
-
         obj = [1, "string", datetime(2024, 2, 13), {"key": datetime(2024, 2, 12)}]
 
         formatted = format_for_json(obj)
@@ -245,6 +271,56 @@ class TestFormatForJson:
         assert format_for_json(True) is True
         assert format_for_json(None) is None
 
+    def test_format_deeply_nested(self):
+        """Test that nesting up to the depth limit is formatted."""
+        obj: dict = {}
+        node = obj
+        for _ in range(MAX_NESTING_DEPTH - 1):
+            node["child"] = {}
+            node = node["child"]
+
+        formatted = format_for_json(obj)
+
+        assert isinstance(formatted, dict)
+        assert "child" in formatted
+
+    def test_format_rejects_excessive_nesting(self):
+        """Test that nesting past the depth limit raises ValueError."""
+        obj: list = []
+        node = obj
+        for _ in range(MAX_NESTING_DEPTH):
+            node.append([])
+            node = node[0]
+
+        with pytest.raises(ValueError):
+            format_for_json(obj)
+
+    def test_format_rejects_circular_reference(self):
+        """Test that a self-referencing container raises instead of looping."""
+        obj: dict = {"name": "test"}
+        obj["self"] = obj
+
+        with pytest.raises(ValueError):
+            format_for_json(obj)
+
+    def test_format_preserves_order(self):
+        """Test that key and item order is preserved."""
+        formatted = format_for_json({"b": 1, "a": (2, 3), "c": {"z": 0, "y": 1}})
+
+        assert list(formatted) == ["b", "a", "c"]
+        assert formatted["a"] == [2, 3]
+        assert list(formatted["c"]) == ["z", "y"]
+
+    def test_dump_matches_format(self):
+        """Test that dump_for_json encodes the same JSON as format_for_json."""
+        obj = {"created": datetime(2024, 2, 13, 15, 30), "items": (1, "two", None)}
+
+        assert json.loads(dump_for_json(obj)) == format_for_json(obj)
+
+    def test_dump_converts_non_str_keys(self):
+        """Test that non-string dict keys are encoded as strings, as json.dumps does."""
+        assert dump_for_json({1: "a", None: "b"}) == json.dumps({1: "a", None: "b"}, separators=(",", ":")).encode()
+
 
 class TestMergeResults:
     """Test result merging."""
@@ -288,3 +364,24 @@ class TestMergeResults:
 
         assert isinstance(merged, dict)
         assert len(merged) == 0
+
+    def test_merge_keeps_first_error(self):
+        """Test that result1's error stays primary over result2's."""
+        merged = merge_results({"error": "first"}, {"error": "second"})
+
+        assert merged["error"] == "first"
+        assert "alternate_error" not in merged
+
+    def test_merge_notes_alternate_error(self):
+        """Test that result2's error is noted when result1 succeeded."""
+        merged = merge_results({"error": None}, {"error": "second"})
+
+        assert merged["error"] is None
+        assert merged["alternate_error"] == "second"
+
+    def test_merge_keeps_error_only_in_second(self):
+        """Test that an error only result2 carries is not dropped."""
+        merged = merge_results({"matching_score": 0.8}, {"error": "second"})
+
+        assert merged["error"] == "second"
+        assert "alternate_error" not in merged